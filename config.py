@@ -43,6 +43,8 @@ class Config:
     
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///meme_trader.db')
+    # On-disk API caches; anchored to the project root so the working directory doesn't matter
+    CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
     
     # Wallet Configuration
     MNEMONIC = os.getenv('MNEMONIC')
@@ -85,6 +87,7 @@ class Config:
     # Scanner Configuration
     SCAN_INTERVAL_SECONDS = int(os.getenv('SCAN_INTERVAL_SECONDS', '3600'))  # hourly discovery job
     WATCHLIST_POLL_SECONDS = int(os.getenv('WATCHLIST_POLL_SECONDS', '60'))  # monitor check interval
+    WATCHLIST_MONITOR_ENABLED = os.getenv('WATCHLIST_MONITOR_ENABLED', 'true').lower() == 'true'  # start monitor with the bot
     CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', '600'))  # TTL for heavy API lookups
     SCAN_MIN_SCORE = int(os.getenv('SCAN_MIN_SCORE', '70'))  # only return wallets scored >= 70
     
@@ -10,6 +10,7 @@ from .models import (
     WalletData,
     TokenData,
     TradeData,
+    MirrorTradeData,
     AlertData,
     ExecutorData
 )
@@ -22,6 +23,7 @@ __all__ = [
     'WalletData',
     'TokenData',
     'TradeData',
+    'MirrorTradeData',
     'AlertData',
     'ExecutorData'
 ] 
\ No newline at end of file
@@ -64,6 +64,18 @@ class ExecutorData:
     keystore_path: str
     created_at: int
 
+@dataclass
+class MirrorTradeData:
+    """Mirror trade log entry"""
+    source_wallet: str
+    token_address: str
+    action: str
+    tx_hash: Optional[str]
+    amount_usd: float
+    timestamp: int
+    success: bool
+    error_message: Optional[str]
+
 @dataclass
 class TradeAlertData:
     """Trade alert data structure"""
@@ -211,6 +223,19 @@ class DatabaseManager:
                         created_at TEXT NOT NULL
                     );
                     
+                    -- Mirror trades copied from watched wallets
+                    CREATE TABLE IF NOT EXISTS mirror_trades (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        source_wallet TEXT NOT NULL,
+                        token_address TEXT NOT NULL,
+                        action TEXT NOT NULL,
+                        tx_hash TEXT,
+                        amount_usd REAL DEFAULT 0,
+                        timestamp INTEGER NOT NULL,
+                        success BOOLEAN NOT NULL,
+                        error_message TEXT
+                    );
+                    
                     -- Create indexes for performance
                     CREATE INDEX IF NOT EXISTS idx_watchlist_active ON watchlist(active);
                     CREATE INDEX IF NOT EXISTS idx_wallets_score ON wallets(score DESC);
@@ -219,6 +244,7 @@ class DatabaseManager:
                     CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp DESC);
                     CREATE INDEX IF NOT EXISTS idx_alerts_type ON alerts(type);
                     CREATE INDEX IF NOT EXISTS idx_key_ledger_service ON key_ledger(service);
+                    CREATE INDEX IF NOT EXISTS idx_mirror_trades_timestamp ON mirror_trades(timestamp DESC);
                 """)
                 
                 conn.commit()
@@ -331,6 +357,34 @@ class DatabaseManager:
             logger.error(f"Failed to get wallet metrics: {e}")
             return None
     
+    def add_tokens(self, tokens: List[TokenData]) -> bool:
+        """Insert a batch of tokens in one transaction, keeping rows that already exist"""
+        rows = [
+            (token.contract, token.chain, token.liquidity_usd, token.locked,
+             token.owner, token.honeypot, token.last_checked)
+            for token in tokens
+        ]
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    INSERT OR IGNORE INTO tokens
+                    (contract, chain, liquidity_usd, locked, owner, honeypot, last_checked)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                return True
+        except Exception as e:
+            logger.error(f"Failed to add {len(rows)} tokens: {e}")
+            return False
+    
+    def get_token_count(self) -> int:
+        """Get number of tokens stored"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+        except Exception as e:
+            logger.error(f"Failed to count tokens: {e}")
+            return 0
+    
     def add_trade(self, trade: TradeData) -> bool:
         """Add trade to database"""
         try:
@@ -369,6 +423,53 @@ class DatabaseManager:
             logger.error(f"Failed to get wallet trades: {e}")
             return []
     
+    def add_mirror_trades(self, trades: List[MirrorTradeData],
+                          conn: Optional[sqlite3.Connection] = None) -> bool:
+        """Insert a batch of mirror trades in one transaction, optionally on an open connection"""
+        rows = [
+            (trade.source_wallet, trade.token_address, trade.action, trade.tx_hash,
+             trade.amount_usd, trade.timestamp, trade.success, trade.error_message)
+            for trade in trades
+        ]
+        own_conn = conn is None
+        try:
+            if own_conn:
+                conn = sqlite3.connect(self.db_path)
+            # Commits on success and rolls back on error, so a failed batch leaves nothing behind
+            with conn:
+                conn.executemany("""
+                    INSERT INTO mirror_trades
+                    (source_wallet, token_address, action, tx_hash, amount_usd, timestamp, success, error_message)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to add {len(rows)} mirror trades: {e}")
+            return False
+        finally:
+            if own_conn and conn is not None:
+                conn.close()
+    
+    def get_mirror_trades(self, limit: int = 100) -> List[Dict]:
+        """Get the most recent mirror trades"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT source_wallet, token_address, action, tx_hash, amount_usd,
+                           timestamp, success, error_message
+                    FROM mirror_trades
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ?
+                """, (limit,))
+                
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to get mirror trades: {e}")
+            return []
+    
     def add_alert(self, alert_type: str, payload: str) -> bool:
         """Add alert to database"""
         try:
@@ -4,10 +4,11 @@ Base integration classes for Meme Trader V4 Pro
 
 import asyncio
 import aiohttp
+import orjson
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -15,19 +16,31 @@ logger = logging.getLogger(__name__)
 class BaseAPIClient(ABC):
     """Base class for all API integrations"""
     
+    # Default headers sent on every request of the client's session
+    session_headers: Dict[str, str] = {}
+    
     def __init__(self, api_key: str, base_url: str, rate_limit: int = 60):
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.rate_limit = rate_limit
         self.session = None
-        self.last_request_time = datetime.utcnow()
-        self.request_count = 0
+        self._tokens = float(rate_limit)
+        self._refill_time = time.monotonic()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        
+    def create_connector(self) -> Optional[aiohttp.TCPConnector]:
+        """Connector for new sessions (None uses aiohttp defaults)"""
+        return None
         
     async def get_session(self):
         """Get or create aiohttp session"""
         if self.session is None or self.session.closed:
             timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            self.session = aiohttp.ClientSession(
+                timeout=timeout,
+                connector=self.create_connector(),
+                headers=self.session_headers
+            )
         return self.session
     
     async def close(self):
@@ -36,27 +49,40 @@ class BaseAPIClient(ABC):
             await self.session.close()
             
     async def rate_limit_check(self):
-        """Check and enforce rate limits"""
-        now = datetime.utcnow()
+        """Enforce rate_limit requests per minute as a token bucket"""
+        now = time.monotonic()
+        interval = 60 / self.rate_limit
         
-        # Reset counter every minute
-        if now - self.last_request_time > timedelta(minutes=1):
-            self.request_count = 0
-            self.last_request_time = now
-            
-        # Wait if we've hit the limit
-        if self.request_count >= self.rate_limit:
-            wait_time = 60 - (now - self.last_request_time).total_seconds()
-            if wait_time > 0:
-                logger.info(f"Rate limit hit for {self.__class__.__name__}, waiting {wait_time:.1f}s")
-                await asyncio.sleep(wait_time)
-                self.request_count = 0
-                self.last_request_time = datetime.utcnow()
+        # Refill for the time elapsed, up to one minute's worth of burst
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._refill_time) / interval)
+        self._refill_time = now
         
-        self.request_count += 1
+        # Take a token before sleeping so concurrent callers queue behind each other
+        self._tokens -= 1
+        if self._tokens < 0:
+            wait_time = -self._tokens * interval
+            logger.info(f"Rate limit hit for {self.__class__.__name__}, waiting {wait_time:.1f}s")
+            await asyncio.sleep(wait_time)
     
-    async def make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
-        """Make rate-limited API request"""
+    async def coalesce_request(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fetch once per key, sharing its result with concurrent callers"""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        result = None
+        try:
+            result = await fetch()
+            return result
+        finally:
+            # Waiters get None if the owner failed; they fall back like any miss
+            self._inflight.pop(key, None)
+            future.set_result(result)
+    
+    async def make_request(self, method: str, endpoint: str, raise_for_status: bool = False,
+                           **kwargs) -> Optional[Dict]:
+        """Make rate-limited API request; with raise_for_status, HTTP errors raise ClientResponseError"""
         await self.rate_limit_check()
         
         session = await self.get_session()
@@ -71,7 +97,9 @@ class BaseAPIClient(ABC):
         try:
             async with session.request(method, url, **kwargs) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return await response.json(loads=orjson.loads)
+                elif raise_for_status and response.status >= 400:
+                    response.raise_for_status()
                 elif response.status == 429:
                     logger.warning(f"Rate limited by {self.__class__.__name__}")
                     await asyncio.sleep(60)
@@ -79,6 +107,12 @@ class BaseAPIClient(ABC):
                 else:
                     logger.error(f"API error {response.status}: {await response.text()}")
                     return None
+        except aiohttp.ClientResponseError as e:
+            # Carries the status and headers (e.g. Retry-After) for the caller's back-off
+            if raise_for_status:
+                raise
+            logger.error(f"Request failed: {e}")
+            return None
         except Exception as e:
             logger.error(f"Request failed: {e}")
             return None
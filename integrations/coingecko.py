@@ -2,19 +2,43 @@
 CoinGecko API integration for price data and market information
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import os
+import aiohttp
+from typing import Dict, List, Optional, Tuple
 from .base import BaseAPIClient
+from config import Config
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Prices are short-lived; CoinGecko accepts up to 100 contracts per token_price call
+PRICE_CACHE_TTL = 60
+PRICE_BATCH_SIZE = 100
+# Back-off for failed lookups when the server sends no Retry-After
+ERROR_CACHE_TTL = 5
+# Prices are persisted so a restart doesn't refetch the whole watchlist
+PRICE_CACHE_PATH = os.path.join(Config.CACHE_DIR, 'coingecko.sqlite')
+
 
 class CoinGeckoClient(BaseAPIClient):
     """CoinGecko API client for cryptocurrency prices and market data"""
     
+    # JSON payloads compress well; always ask for a compressed body
+    session_headers = {
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate'
+    }
+    
     def __init__(self, api_key: str):
         super().__init__(api_key, "https://api.coingecko.com/api/v3", rate_limit=50)
+        self.cache = TTLCache(ttl=PRICE_CACHE_TTL, persist_path=PRICE_CACHE_PATH, maxsize=10_000)
         
+    def create_connector(self) -> aiohttp.TCPConnector:
+        """Small keep-alive pool so price lookups reuse one TLS connection"""
+        return aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=30)
+    
     async def health_check(self) -> bool:
         """Check CoinGecko API health"""
         try:
@@ -24,39 +48,113 @@ class CoinGeckoClient(BaseAPIClient):
             logger.error(f"CoinGecko health check failed: {e}")
             return False
     
-    async def get_token_price(self, contract_address: str, vs_currency: str = 'usd') -> Optional[float]:
-        """Get current price for a token by contract address"""
+    def _get_platform(self, contract_address: str) -> str:
+        """Determine CoinGecko asset platform from the address format"""
+        if contract_address.startswith('0x'):
+            return 'ethereum'
+        if len(contract_address) > 40:  # Likely Solana
+            return 'solana'
+        return 'ethereum'  # Default
+    
+    async def _fetch_token_prices(self, platform: str, contract_addresses: List[str], vs_currency: str) -> Optional[Dict]:
+        """Fetch one token_price batch, returning an error dict on HTTP errors"""
+        params = {
+            'contract_addresses': ','.join(contract_addresses),
+            'vs_currencies': vs_currency
+        }
+        
         try:
-            # Map chain prefixes for CoinGecko
-            chain_mapping = {
-                '0x': 'ethereum',
-                'So': 'solana',  # Solana addresses start with letters
-                'bnb': 'binance-smart-chain'
-            }
-            
-            # Determine platform based on address format
-            platform = 'ethereum'  # Default
-            if contract_address.startswith('0x'):
-                platform = 'ethereum'
-            elif len(contract_address) > 40:  # Likely Solana
-                platform = 'solana'
-            
-            endpoint = f"simple/token_price/{platform}"
-            params = {
-                'contract_addresses': contract_address,
-                'vs_currencies': vs_currency
-            }
-            
-            response = await self.make_request('GET', endpoint, params=params)
+            # Network errors come back as None and are not cached, so the next call retries
+            return await self.make_request('GET', f'simple/token_price/{platform}',
+                                           raise_for_status=True, params=params)
+        except aiohttp.ClientResponseError as e:
+            retry_after = None
+            if e.status == 429 and e.headers:
+                retry_after = e.headers.get('Retry-After')
+                logger.warning(f"Rate limited by CoinGecko, backing off {retry_after or ERROR_CACHE_TTL}s")
+            else:
+                logger.error(f"CoinGecko API error {e.status}: {e.message}")
+            try:
+                retry_after = float(retry_after) if retry_after else ERROR_CACHE_TTL
+            except ValueError:
+                retry_after = ERROR_CACHE_TTL
+            return {'error': str(e), '_retry_after': retry_after, '_status': e.status}
+    
+    async def get_token_prices(self, contract_addresses: List[str], vs_currency: str = 'usd') -> Dict[str, Optional[float]]:
+        """Get current prices for many tokens, batching uncached lookups per platform"""
+        prices: Dict[str, Optional[float]] = {}
+        uncached: Dict[str, List[str]] = {}
+        owned: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        cache_keys: Dict[str, Tuple[str, str, str]] = {}
+        loop = asyncio.get_running_loop()
+        
+        for contract_address in contract_addresses:
+            cache_key = cache_keys[contract_address] = ('cg_price', contract_address.lower(), vs_currency)
+            price = self.cache.get(cache_key)
+            if isinstance(price, dict):  # Cached error, still backing off
+                prices[contract_address] = None
+                continue
+            prices[contract_address] = price
+            if price is not None:
+                continue
             
-            if response and contract_address.lower() in response:
-                return response[contract_address.lower()].get(vs_currency)
+            # Piggyback on a lookup another caller already has in flight
+            inflight = self._inflight.get(cache_key)
+            if inflight is not None:
+                waiting[contract_address] = inflight
+                continue
             
-            return None
-            
-        except Exception as e:
-            logger.error(f"Failed to get token price: {e}")
-            return None
+            owned[cache_key] = self._inflight[cache_key] = loop.create_future()
+            uncached.setdefault(self._get_platform(contract_address), []).append(contract_address)
+        
+        try:
+            for platform, addresses in uncached.items():
+                for i in range(0, len(addresses), PRICE_BATCH_SIZE):
+                    batch = addresses[i:i + PRICE_BATCH_SIZE]
+                    try:
+                        response = await self._fetch_token_prices(platform, batch, vs_currency)
+                        if not response:
+                            continue
+                        
+                        if 'error' in response:
+                            # Negative-cache the failure so callers back off until it clears
+                            self.cache.set_many(
+                                ((cache_keys[contract_address], response) for contract_address in batch),
+                                ttl=response['_retry_after']
+                            )
+                            continue
+                        
+                        fresh = []
+                        for contract_address in batch:
+                            token_data = response.get(contract_address.lower()) or response.get(contract_address) or {}
+                            price = token_data.get(vs_currency)
+                            if price is not None:
+                                prices[contract_address] = price
+                                fresh.append((cache_keys[contract_address], price))
+                        # One disk commit per batch rather than per token
+                        self.cache.set_many(fresh)
+                    
+                    except Exception as e:
+                        logger.error(f"Failed to get token prices: {e}")
+        finally:
+            for addresses in uncached.values():
+                for contract_address in addresses:
+                    cache_key = cache_keys[contract_address]
+                    future = owned.pop(cache_key, None)
+                    if future is not None:
+                        self._inflight.pop(cache_key, None)
+                        future.set_result(prices[contract_address])
+        
+        for contract_address, future in waiting.items():
+            prices[contract_address] = await asyncio.shield(future)
+        
+        return prices
+    
+    async def get_token_price(self, contract_address: str, vs_currency: str = 'usd') -> Optional[float]:
+        """Get current price for a token by contract address"""
+        prices = await self.get_token_prices([contract_address], vs_currency)
+        return prices.get(contract_address)
     
     async def get_token_info(self, contract_address: str) -> Optional[Dict]:
         """Get detailed token information"""
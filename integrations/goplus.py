@@ -4,17 +4,31 @@ GoPlus API integration for token security and honeypot detection
 
 import asyncio
 import logging
+import aiohttp
 from typing import Dict, List, Optional, Any
 from .base import BaseAPIClient
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Security verdicts are stable for minutes; failures are retried after a short back-off
+SECURITY_CACHE_TTL = 300
+ERROR_CACHE_TTL = 5
+# token_security accepts a comma-separated list of contracts per call
+SECURITY_BATCH_SIZE = 100
+_MISS = object()
+
 
 class GoPlusClient(BaseAPIClient):
     """GoPlus API client for token security analysis"""
     
     def __init__(self, api_key: str):
         super().__init__(api_key, "https://api.gopluslabs.io/api/v1", rate_limit=100)
+        self.cache = TTLCache(ttl=SECURITY_CACHE_TTL, maxsize=10_000)
+        
+    def create_connector(self) -> aiohttp.TCPConnector:
+        """Keep-alive pool so security checks reuse warm TLS connections"""
+        return aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=30)
         
     async def health_check(self) -> bool:
         """Check GoPlus API health"""
@@ -37,22 +51,70 @@ class GoPlusClient(BaseAPIClient):
         Returns:
             Security analysis results or None if failed
         """
+        cache_key = ('token_security', str(chain_id), contract_address.lower())
+        cached = self.cache.get(cache_key, _MISS)
+        if cached is not _MISS:
+            return cached
+        
+        # Concurrent checks of the same token share one upstream request
+        result = await self.coalesce_request(
+            cache_key, lambda: self._fetch_token_security(chain_id, contract_address)
+        )
+        # Failures are cached briefly so an outage isn't re-requested on every check
+        self.cache.set(cache_key, result, ttl=None if result is not None else ERROR_CACHE_TTL)
+        return result
+    
+    async def check_token_security_batch(self, chain_id: str, contract_addresses: List[str]) -> Dict[str, Optional[Dict]]:
+        """Check many tokens, fetching uncached ones in shared requests; keys are lowercased addresses"""
+        results: Dict[str, Optional[Dict]] = {}
+        uncached: List[str] = []
+        
+        for contract_address in contract_addresses:
+            address = contract_address.lower()
+            if address in results:
+                continue
+            cached = self.cache.get(('token_security', str(chain_id), address), _MISS)
+            if cached is _MISS:
+                uncached.append(address)
+                cached = None
+            results[address] = cached
+        
+        for i in range(0, len(uncached), SECURITY_BATCH_SIZE):
+            batch = uncached[i:i + SECURITY_BATCH_SIZE]
+            security_data = await self._fetch_security_data(chain_id, batch)
+            for address in batch:
+                token_data = security_data.get(address)
+                result = self._parse_security_result(token_data) if token_data else None
+                results[address] = result
+                self.cache.set(('token_security', str(chain_id), address), result,
+                               ttl=None if result is not None else ERROR_CACHE_TTL)
+        
+        return results
+    
+    async def _fetch_token_security(self, chain_id: str, contract_address: str) -> Optional[Dict]:
+        """Fetch and parse token security from GoPlus"""
+        security_data = await self._fetch_security_data(chain_id, [contract_address])
+        token_data = security_data.get(contract_address.lower())
+        if token_data:
+            return self._parse_security_result(token_data)
+        return None
+    
+    async def _fetch_security_data(self, chain_id: str, contract_addresses: List[str]) -> Dict[str, Dict]:
+        """Fetch raw token security results keyed by lowercased address, empty on failure"""
         try:
             endpoint = f"token_security/{chain_id}"
-            params = {'contract_addresses': contract_address}
+            params = {'contract_addresses': ','.join(contract_addresses)}
             
             response = await self.make_request('GET', endpoint, params=params)
             
             if response and 'result' in response:
-                token_data = response['result'].get(contract_address.lower())
-                if token_data:
-                    return self._parse_security_result(token_data)
+                return {address.lower(): data for address, data in response['result'].items()}
             
-            return None
+            return {}
             
         except Exception as e:
             logger.error(f"Failed to check token security: {e}")
-            return None
+            return {}
     
     def _parse_security_result(self, token_data: Dict) -> Dict:
         """Parse GoPlus security result into standardized format"""
@@ -20,6 +20,10 @@ class HeliusClient(BaseAPIClient):
     def __init__(self):
         super().__init__(None, "https://api.helius.xyz/v0", rate_limit=1000)
         
+    def create_connector(self) -> aiohttp.TCPConnector:
+        """Keep-alive pool sized for concurrent watched-wallet polling"""
+        return aiohttp.TCPConnector(limit=200, limit_per_host=50, ttl_dns_cache=300, keepalive_timeout=30)
+        
     async def _get_headers(self) -> Dict[str, str]:
         """Get headers with rotated API key"""
         api_key = await key_manager.get_key('solana')
@@ -149,6 +153,14 @@ class HeliusClient(BaseAPIClient):
     
     async def monitor_wallet_activity(self, wallet_address: str) -> List[Dict]:
         """Monitor real-time wallet activity"""
+        # Overlapping polls of the same wallet share one upstream request
+        return await self.coalesce_request(
+            ('wallet_activity', wallet_address),
+            lambda: self._fetch_wallet_activity(wallet_address)
+        )
+    
+    async def _fetch_wallet_activity(self, wallet_address: str) -> List[Dict]:
+        """Fetch transactions from the last 5 minutes for a wallet"""
         try:
             headers = await self._get_headers()
             endpoint = f'/addresses/{wallet_address}/transactions'
@@ -307,13 +307,18 @@ Jupiter API Integration for Solana Trading and Route Optimization
 import logging
 import aiohttp
 import asyncio
+import orjson
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
 from .base import BaseAPIClient
+from utils.cache import TTLCache
 from utils.key_manager import key_manager
 
 logger = logging.getLogger(__name__)
 
+# Seconds a failed quote is remembered before Jupiter is asked again
+ERROR_CACHE_TTL = 5
+
 
 class JupiterClient(BaseAPIClient):
     """Jupiter API client for Solana trading"""
@@ -321,6 +326,12 @@ class JupiterClient(BaseAPIClient):
     def __init__(self):
         super().__init__(None, "https://quote-api.jup.ag/v6", rate_limit=100)
         self.price_api_url = "https://api.jup.ag/price/v2"
+        # Only failed quotes are cached; live quotes go stale too quickly
+        self.failed_quotes = TTLCache(ttl=ERROR_CACHE_TTL, maxsize=1_000)
+        
+    def create_connector(self) -> aiohttp.TCPConnector:
+        """Keep-alive pool so quote and price lookups reuse warm TLS connections"""
+        return aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=30)
         
     async def health_check(self) -> bool:
         """Check if Jupiter API is accessible"""
@@ -334,6 +345,21 @@ class JupiterClient(BaseAPIClient):
     async def get_quote(self, input_mint: str, output_mint: str, amount: int, 
                        slippage_bps: int = 100) -> Optional[Dict]:
         """Get swap quote from Jupiter"""
+        quote_key = ('quote', input_mint, output_mint, amount, slippage_bps)
+        if self.failed_quotes.get(quote_key):
+            return None
+        
+        # Identical concurrent quote requests share one upstream call
+        quote = await self.coalesce_request(
+            quote_key, lambda: self._fetch_quote(input_mint, output_mint, amount, slippage_bps)
+        )
+        if quote is None:
+            self.failed_quotes.set(quote_key, True)
+        return quote
+    
+    async def _fetch_quote(self, input_mint: str, output_mint: str, amount: int,
+                           slippage_bps: int) -> Optional[Dict]:
+        """Fetch a swap quote from Jupiter"""
         try:
             params = {
                 'inputMint': input_mint,
@@ -390,7 +416,7 @@ class JupiterClient(BaseAPIClient):
             
             async with session.get(url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=orjson.loads)
                     price_data = data.get('data', {}).get(mint_address)
                     if price_data:
                         return float(price_data.get('price', 0))
@@ -4,36 +4,84 @@ Simple startup script for Meme Trader V4 Pro
 """
 
 import asyncio
+import atexit
+import importlib
 import platform
 import logging
+import queue
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 # Add the project root to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-# Configure logging
+# Configure logging: handlers run on a listener thread so log calls never block the event loop
+_log_queue = queue.SimpleQueue()
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_log_formatter)
+_file_handler = RotatingFileHandler('bot.log', maxBytes=10_000_000, backupCount=3)
+_file_handler.setFormatter(_log_formatter)
+_log_listener = QueueListener(_log_queue, _stream_handler, _file_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Only merge args into the message here; the listener's handlers apply the real format
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('bot.log')
-    ]
+    handlers=[_queue_handler]
 )
 
 logger = logging.getLogger(__name__)
 
+# Slow-to-import modules warmed in the background while the database initializes
+HEAVY_MODULES = ("telegram", "telegram.ext", "bot.commands")
+
+_watchdog_tasks = []
+
+def _notify_systemd_ready():
+    """Report READY=1 (and keep the watchdog fed) when run as a Type=notify unit"""
+    try:
+        import sdnotify
+    except ImportError:
+        return
+    
+    notifier = sdnotify.SystemdNotifier()
+    notifier.notify("READY=1")
+    
+    watchdog_usec = int(os.getenv("WATCHDOG_USEC", "0") or 0)
+    if watchdog_usec:
+        async def _watchdog():
+            while True:
+                notifier.notify("WATCHDOG=1")
+                await asyncio.sleep(watchdog_usec / 2_000_000)
+        _watchdog_tasks.append(asyncio.get_running_loop().create_task(_watchdog()))
+
 def main():
     """Main startup function"""
     try:
-        # Ensure a compatible event loop on Windows
+        # Prefer a libuv-backed event loop (uvloop / winloop) when installed
         if platform.system() == "Windows":
             try:
-                asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-            except Exception:
+                import winloop
+                asyncio.set_event_loop_policy(winloop.EventLoopPolicy())
+            except ImportError:
+                try:
+                    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+                except Exception:
+                    pass
+        else:
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            except ImportError:
                 pass
         logger.info("Starting Meme Trader V4 Pro...")
         
@@ -53,20 +101,25 @@ def main():
             logger.error("See env_template.txt for required variables")
             return False
         
-        # Initialize database
-        logger.info("Initializing database...")
-        from db import create_tables
-        create_tables()
-        logger.info("Database initialized")
-        
-        # Initialize integrations
-        logger.info("Initializing API integrations...")
-        from startup import initialize_integrations
-        # Initialize integrations (async wrapper)
-        try:
-            asyncio.run(initialize_integrations())
-        except RuntimeError:
-            pass
+        # Import heavy modules in parallel with database initialization
+        heavy_modules = list(HEAVY_MODULES)
+        if Config.WATCHLIST_MONITOR_ENABLED:
+            heavy_modules.append("monitor.watchlist_monitor")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            prefetch = [executor.submit(importlib.import_module, name) for name in heavy_modules]
+            
+            # Initialize database
+            logger.info("Initializing database...")
+            from db import create_tables
+            create_tables()
+            logger.info("Database initialized")
+            
+            for future in prefetch:
+                try:
+                    future.result()
+                except Exception as e:
+                    # The regular import below reports real failures
+                    logger.debug(f"Background import failed: {e}")
         
         # Start the bot
         logger.info("Starting Telegram bot...")
@@ -127,6 +180,15 @@ def main():
         # Set Telegram command menu via async post_init hook
         from telegram import BotCommand
         async def _post_init(app):
+            # Initialize integrations on PTB's loop so their sessions stay usable
+            logger.info("Initializing API integrations...")
+            try:
+                from startup import initialize_integrations
+                if not await initialize_integrations():
+                    logger.error("Integration initialization failed")
+            except Exception as e:
+                logger.error(f"Failed to initialize integrations: {e}")
+            
             try:
                 await app.bot.set_my_commands([
                     BotCommand("start", "Start the bot"),
@@ -144,16 +206,19 @@ def main():
                 ])
                 
                 # Start watchlist monitor
-                try:
-                    from monitor.watchlist_monitor import watchlist_monitor
-                    await watchlist_monitor.initialize()
-                    await watchlist_monitor.start_monitoring()
-                    logger.info("Watchlist monitor started")
-                except Exception as e:
-                    logger.error(f"Failed to start watchlist monitor: {e}")
+                if Config.WATCHLIST_MONITOR_ENABLED:
+                    try:
+                        from monitor.watchlist_monitor import watchlist_monitor
+                        await watchlist_monitor.initialize()
+                        await watchlist_monitor.start_monitoring()
+                        logger.info("Watchlist monitor started")
+                    except Exception as e:
+                        logger.error(f"Failed to start watchlist monitor: {e}")
                     
             except Exception:
                 pass
+            
+            _notify_systemd_ready()
         application.post_init = _post_init
         
         logger.info("Bot handlers configured")
@@ -161,12 +226,9 @@ def main():
         logger.info("Starting bot...")
         logger.info("Send /start to your bot to begin!")
         
-        # Ensure a current event loop exists (Python 3.13 get_event_loop strictness)
-        try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        # run_polling() drives asyncio.get_event_loop(), which no longer creates
+        # a loop implicitly on newer Pythons; main() never has a running loop here
+        asyncio.set_event_loop(asyncio.new_event_loop())
 
         # Start the bot using PTB's built-in runner
         application.run_polling()
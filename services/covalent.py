@@ -6,15 +6,62 @@ Handles Ethereum and BSC chain data with API key rotation
 import aiohttp
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+import orjson
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from dataclasses import dataclass, field
 from config import Config
+from utils.cache import TTLCache
 from utils.key_manager import get_api_key, mark_key_rate_limited, mark_key_quota_exhausted
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Upper bound on transaction pages fetched per wallet
+MAX_PAGES = 5
+
+# Scoring tables: points[i] is awarded when a metric clears i thresholds.
+# Win rate and max multiplier count thresholds met (>=) via bisect_right;
+# the others require strictly exceeding them (>) via bisect_left.
+_WIN_RATE_THRESHOLDS = (65, 70, 80)
+_WIN_RATE_POINTS = (0, 10, 15, 20)
+_MULTIPLIER_THRESHOLDS = (50, 100, 200)
+_MULTIPLIER_POINTS = (0, 10, 15, 20)
+_AVG_ROI_THRESHOLDS = (2, 3, 5)
+_AVG_ROI_POINTS = (0, 5, 10, 15)
+_VOLUME_THRESHOLDS = (15000, 50000, 100000)
+_VOLUME_POINTS = (0, 5, 10, 15)
+_TRADE_COUNT_THRESHOLDS = (15, 30)
+_TRADE_COUNT_POINTS = (0, 5, 10)
+
+_CHAIN_NAMES = MappingProxyType({
+    1: 'ethereum',
+    56: 'bsc',
+    137: 'polygon',
+    42161: 'arbitrum',
+    10: 'optimism'
+})
+
+def _address_to_int(address: str) -> Optional[int]:
+    """Convert a hex address to an int for case-insensitive compares, or None if invalid"""
+    try:
+        return int(address, 16)
+    except (TypeError, ValueError):
+        return None
+
+def _parse_block_ts(block_signed_at: str) -> float:
+    """Convert a Covalent ISO timestamp to a UTC epoch, or 0.0 if unparseable"""
+    try:
+        signed_at = datetime.fromisoformat(block_signed_at.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return 0.0
+    if signed_at.tzinfo is None:
+        signed_at = signed_at.replace(tzinfo=timezone.utc)
+    return signed_at.timestamp()
+
+@dataclass(slots=True)
 class TokenTransfer:
     """Token transfer data"""
     tx_hash: str
@@ -33,8 +80,15 @@ class TokenTransfer:
     gas_price: int
     fees_paid: float
     gas_quote_rate: float
+    from_addr_int: Optional[int] = field(init=False, repr=False)
+    block_ts: float = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        # Normalized once so direction checks are a single integer compare
+        self.from_addr_int = _address_to_int(self.from_address)
+        self.block_ts = _parse_block_ts(self.block_signed_at)
 
-@dataclass
+@dataclass(slots=True)
 class WalletMetrics:
     """Wallet performance metrics"""
     address: str
@@ -48,34 +102,117 @@ class WalletMetrics:
     score: float
     risk_flags: List[str]
 
+def _parse_transfers(items: List[Dict]) -> List[TokenTransfer]:
+    """Build TokenTransfers from a page of Covalent transactions_v3 items"""
+    transfers = []
+    for tx in items:
+        # Transaction-level fields are shared by all of its transfers
+        txget = tx.get
+        tx_hash = tx['tx_hash']
+        block_height = tx['block_height']
+        block_signed_at = tx['block_signed_at']
+        gas_offered = txget('gas_offered', 0)
+        gas_spent = txget('gas_spent', 0)
+        gas_price = txget('gas_price', 0)
+        fees_paid = float(txget('fees_paid', 0))
+        gas_quote_rate = float(txget('gas_quote_rate', 0))
+        
+        # Extract token transfers
+        for transfer in txget('transfers', []):
+            tget = transfer.get
+            if tget('token_address'):  # Skip native token transfers
+                transfers.append(TokenTransfer(
+                    tx_hash=tx_hash,
+                    block_height=block_height,
+                    block_signed_at=block_signed_at,
+                    from_address=transfer['from_address'],
+                    to_address=transfer['to_address'],
+                    token_address=transfer['token_address'],
+                    token_symbol=tget('contract_ticker_symbol', ''),
+                    token_name=tget('contract_name', ''),
+                    amount=transfer['delta'],
+                    decimals=tget('contract_decimals', 18),
+                    value_usd=float(tget('quote', 0)),
+                    gas_offered=gas_offered,
+                    gas_spent=gas_spent,
+                    gas_price=gas_price,
+                    fees_paid=fees_paid,
+                    gas_quote_rate=gas_quote_rate
+                ))
+    return transfers
+
+def _pair_fifo(buy_bh: List[int], buy_val: List[float], sell_bh: List[int], sell_val: List[float],
+               sell_ts: List[float], cutoff_ts: float) -> Tuple[int, int, float, float, float, int]:
+    """FIFO-match one token's block-sorted buys and sells into trade aggregates"""
+    # Each sell closes the earliest open buy mined before it; only buys with
+    # a positive USD value count as trades
+    trade_count = win_count = recent_count = 0
+    max_multiplier = roi_sum = volume = 0.0
+    n_buys = len(buy_bh)
+    i = 0
+    for j in range(len(sell_bh)):
+        if i >= n_buys:
+            break
+        if buy_bh[i] >= sell_bh[j]:
+            continue
+        buy_value = buy_val[i]
+        i += 1
+        
+        if buy_value > 0:
+            sell_value = sell_val[j] if sell_val[j] > 0 else 0
+            roi = sell_value / buy_value
+            trade_count += 1
+            volume += buy_value
+            roi_sum += roi
+            if roi > 1:
+                win_count += 1
+            if roi > max_multiplier:
+                max_multiplier = roi
+            if sell_ts[j] > cutoff_ts:
+                recent_count += 1
+    
+    return trade_count, win_count, max_multiplier, roi_sum, volume, recent_count
+
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+async def _get_shared_session() -> aiohttp.ClientSession:
+    """Get or create the pooled session reused across Covalent clients"""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            ),
+            timeout=aiohttp.ClientTimeout(total=45),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) MemeTrader/1.0',
+                'Accept': 'application/json, text/plain, */*',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Origin': 'https://www.covalenthq.com',
+                'Referer': 'https://www.covalenthq.com/',
+                'Cache-Control': 'no-cache',
+                'Pragma': 'no-cache',
+                'Connection': 'keep-alive'
+            },
+            trust_env=True
+        )
+    return _shared_session
+
 class CovalentClient:
     """Covalent API client with key rotation and comprehensive wallet analysis"""
     
     def __init__(self):
         # Allow overriding base via env if needed
         self.base_url = getattr(Config, 'COVALENT_API_BASE', None) or "https://api.covalenthq.com/v1"
-        self.session = None
-        self.cache = {}
         self.cache_ttl = Config.CACHE_TTL_SECONDS
+        self.cache = TTLCache(ttl=self.cache_ttl, maxsize=10_000)
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=45),
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) MemeTrader/1.0',
-                    'Accept': 'application/json, text/plain, */*',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Origin': 'https://www.covalenthq.com',
-                    'Referer': 'https://www.covalenthq.com/',
-                    'Cache-Control': 'no-cache',
-                    'Pragma': 'no-cache',
-                    'Connection': 'keep-alive'
-                },
-                trust_env=True
-            )
-        return self.session
+        """Get the aiohttp session shared by all Covalent clients"""
+        return await _get_shared_session()
     
     async def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
         """Make API request with key rotation and error handling"""
@@ -97,7 +234,7 @@ class CovalentClient:
                 session = await self._get_session()
                 async with session.get(url, params=params, headers=request_headers) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = await response.json(loads=orjson.loads)
                         if data.get('error') or data.get('error_code'):
                             logger.error(f"Covalent API error: {data}")
                             return None
@@ -149,6 +286,46 @@ class CovalentClient:
         logger.error("All retry attempts failed")
         return None
     
+    async def _iter_pages(self, endpoint: str, params: Dict, max_pages: int = MAX_PAGES) -> AsyncIterator[Dict]:
+        """Yield result pages, fetching the next page while the caller parses the current one"""
+        page = 0
+        next_task = asyncio.create_task(self._make_request(endpoint, {**params, 'page-number': page}))
+        try:
+            while next_task is not None:
+                data = await next_task
+                next_task = None
+                if not data or 'data' not in data:
+                    return
+                
+                page += 1
+                if page < max_pages and self._has_more_pages(data):
+                    next_task = asyncio.create_task(self._make_request(endpoint, {**params, 'page-number': page}))
+                    await asyncio.sleep(0)  # Let the prefetch start before we parse
+                
+                yield data
+        finally:
+            if next_task is not None:
+                next_task.cancel()
+    
+    def _has_more_pages(self, data: Dict) -> bool:
+        """Check Covalent pagination metadata for a following page"""
+        result = data['data']
+        pagination = result.get('pagination') or {}
+        links = result.get('links') or {}
+        return bool(pagination.get('has_more') or links.get('next'))
+    
+    async def _cached_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        """Make API request, reusing successful responses for the cache TTL"""
+        cache_key = (endpoint, tuple(sorted((params or {}).items())))
+        data = self.cache.get(cache_key)
+        if data is not None:
+            return data
+        
+        data = await self._make_request(endpoint, params)
+        if data is not None:
+            self.cache.set(cache_key, data)
+        return data
+    
     async def get_recent_transactions(self, chain_id: int, limit: int = 1000) -> List[Dict]:
         """Get recent transactions for discovery scanning"""
         try:
@@ -157,14 +334,18 @@ class CovalentClient:
             params = {'page-size': min(limit, 1000)}
             
             data = await self._make_request(endpoint, params)
-            if not data or 'data' not in data:
+            try:
+                blocks = data['data']['items'][:10]  # Last 10 blocks
+            except (KeyError, TypeError):
                 return []
             
             # Extract transactions from recent blocks
             transactions = []
-            for block in data['data']['items'][:10]:  # Last 10 blocks
-                if 'transactions' in block:
+            for block in blocks:
+                try:
                     transactions.extend(block['transactions'])
+                except KeyError:
+                    pass
             
             return transactions[:limit]
             
@@ -187,33 +368,11 @@ class CovalentClient:
             if end_block:
                 params['end-block'] = end_block
             
-            data = await self._make_request(endpoint, params)
-            if not data or 'data' not in data:
-                return []
-            
+            loop = asyncio.get_running_loop()
             transfers = []
-            for tx in data['data']['items']:
-                # Extract token transfers
-                for transfer in tx.get('transfers', []):
-                    if transfer.get('token_address'):  # Skip native token transfers
-                        transfers.append(TokenTransfer(
-                            tx_hash=tx['tx_hash'],
-                            block_height=tx['block_height'],
-                            block_signed_at=tx['block_signed_at'],
-                            from_address=transfer['from_address'],
-                            to_address=transfer['to_address'],
-                            token_address=transfer['token_address'],
-                            token_symbol=transfer.get('contract_ticker_symbol', ''),
-                            token_name=transfer.get('contract_name', ''),
-                            amount=transfer['delta'],
-                            decimals=transfer.get('contract_decimals', 18),
-                            value_usd=float(transfer.get('quote', 0)),
-                            gas_offered=tx.get('gas_offered', 0),
-                            gas_spent=tx.get('gas_spent', 0),
-                            gas_price=tx.get('gas_price', 0),
-                            fees_paid=float(tx.get('fees_paid', 0)),
-                            gas_quote_rate=float(tx.get('gas_quote_rate', 0))
-                        ))
+            async for data in self._iter_pages(endpoint, params):
+                # Parsing is CPU-bound; keep it off the event loop
+                transfers.extend(await loop.run_in_executor(None, _parse_transfers, data['data']['items']))
             
             return transfers
             
@@ -228,7 +387,7 @@ class CovalentClient:
             endpoint = f"/{chain_id}/tokens/{token_address}/token_holders_v3/"
             params = {'page-size': page_size}
             
-            data = await self._make_request(endpoint, params)
+            data = await self._cached_request(endpoint, params)
             if not data or 'data' not in data:
                 return []
             
@@ -243,7 +402,7 @@ class CovalentClient:
         try:
             endpoint = f"/{chain_id}/tokens/{token_address}/"
             
-            data = await self._make_request(endpoint)
+            data = await self._cached_request(endpoint)
             if not data or 'data' not in data:
                 return None
             
@@ -261,104 +420,66 @@ class CovalentClient:
             if not transfers:
                 return None
             
+            # A malformed sender (None) never equals a valid wallet; a malformed
+            # wallet can't be matched at all, or two bad addresses would compare equal
+            addr_int = _address_to_int(address)
+            if addr_int is None:
+                logger.warning(f"Cannot analyze malformed wallet address: {address}")
+                return None
+            
+            # A wallet needs both buys and sells to have any completed trades
+            has_sell = any(t.from_addr_int == addr_int for t in transfers)
+            has_buy = any(t.from_addr_int != addr_int for t in transfers)
+            if not (has_sell and has_buy):
+                return None
+            
             # Group by token for buy/sell analysis
-            token_trades = {}
+            buys_by_token = defaultdict(list)
+            sells_by_token = defaultdict(list)
             for transfer in transfers:
-                token = transfer.token_address
-                if token not in token_trades:
-                    token_trades[token] = {'buys': [], 'sells': []}
-                
                 # Determine if buy or sell based on direction
-                if transfer.from_address.lower() == address.lower():
-                    token_trades[token]['sells'].append(transfer)
+                if transfer.from_addr_int == addr_int:
+                    sells_by_token[transfer.token_address].append(transfer)
                 else:
-                    token_trades[token]['buys'].append(transfer)
+                    buys_by_token[transfer.token_address].append(transfer)
             
             # Calculate performance metrics
-            completed_trades = []
+            trade_count = 0
             total_volume_usd = 0
             recent_activity = 0
-            thirty_days_ago = datetime.now() - timedelta(days=30)
+            win_count = 0
+            max_multiplier = 0.0
+            roi_sum = 0.0
+            thirty_days_ago_ts = (datetime.now(tz=timezone.utc) - timedelta(days=30)).timestamp()
             
-            for token, trades in token_trades.items():
-                if trades['buys'] and trades['sells']:
-                    # Find matching buy/sell pairs
-                    for buy in trades['buys']:
-                        for sell in trades['sells']:
-                            if sell.block_height > buy.block_height:
-                                # Calculate ROI
-                                buy_value = float(buy.value_usd) if buy.value_usd > 0 else 0
-                                sell_value = float(sell.value_usd) if sell.value_usd > 0 else 0
-                                
-                                if buy_value > 0:
-                                    roi = sell_value / buy_value
-                                    completed_trades.append({
-                                        'roi': roi,
-                                        'buy_value': buy_value,
-                                        'sell_value': sell_value,
-                                        'buy_time': buy.block_signed_at,
-                                        'sell_time': sell.block_signed_at
-                                    })
-                                    total_volume_usd += buy_value
-                                    
-                                    # Check recent activity
-                                    sell_time = datetime.fromisoformat(sell.block_signed_at.replace('Z', '+00:00'))
-                                    if sell_time > thirty_days_ago:
-                                        recent_activity += 1
+            for token, token_buys in buys_by_token.items():
+                token_sells = sells_by_token.get(token)
+                if token_sells:
+                    buys = sorted(token_buys, key=lambda t: t.block_height)
+                    sells = sorted(token_sells, key=lambda t: t.block_height)
+                    pairs, wins, token_max, token_roi_sum, volume, recent = _pair_fifo(
+                        [t.block_height for t in buys], [t.value_usd for t in buys],
+                        [t.block_height for t in sells], [t.value_usd for t in sells],
+                        [t.block_ts for t in sells], thirty_days_ago_ts
+                    )
+                    trade_count += pairs
+                    win_count += wins
+                    roi_sum += token_roi_sum
+                    total_volume_usd += volume
+                    recent_activity += recent
+                    if token_max > max_multiplier:
+                        max_multiplier = token_max
             
-            if not completed_trades:
+            if not trade_count:
                 return None
             
-            # Calculate metrics
-            win_rate = len([t for t in completed_trades if t['roi'] > 1]) / len(completed_trades) * 100
-            max_multiplier = max(t['roi'] for t in completed_trades)
-            avg_roi = sum(t['roi'] for t in completed_trades) / len(completed_trades)
-            trade_count = len(completed_trades)
+            # Calculate metrics (ROI aggregates are accumulated while pairing)
+            win_rate = win_count / trade_count * 100
+            avg_roi = roi_sum / trade_count
             
             # Calculate score based on exact weights from requirements
-            score = 0
-            
-            # Win Rate (20 points)
-            if win_rate >= 80:
-                score += 20
-            elif win_rate >= 70:
-                score += 15
-            elif win_rate >= 65:
-                score += 10
-            
-            # Max Multiplier (20 points)
-            if max_multiplier >= 200:
-                score += 20
-            elif max_multiplier >= 100:
-                score += 15
-            elif max_multiplier >= 50:
-                score += 10
-            
-            # Average ROI (15 points)
-            if avg_roi > 5:
-                score += 15
-            elif avg_roi > 3:
-                score += 10
-            elif avg_roi > 2:
-                score += 5
-            
-            # Trading Volume (15 points)
-            if total_volume_usd > 100000:
-                score += 15
-            elif total_volume_usd > 50000:
-                score += 10
-            elif total_volume_usd > 15000:
-                score += 5
-            
-            # Consistency (10 points)
-            if trade_count > 30:
-                score += 10
-            elif trade_count > 15:
-                score += 5
-            
-            # Recency (10 points)
-            if recent_activity > 0:
-                score += 10
+            score = self._calculate_score(win_rate, max_multiplier, avg_roi,
+                                          total_volume_usd, trade_count, recent_activity)
             
             # Risk flags (no negative points for now, could be enhanced)
             risk_flags = []
@@ -380,21 +501,28 @@ class CovalentClient:
             logger.error(f"Failed to analyze wallet performance: {e}")
             return None
     
+    def _calculate_score(self, win_rate: float, max_multiplier: float, avg_roi: float,
+                         total_volume_usd: float, trade_count: int, recent_activity: int) -> int:
+        """Score a wallet from its metrics using the threshold tables"""
+        return (
+            _WIN_RATE_POINTS[bisect_right(_WIN_RATE_THRESHOLDS, win_rate)]
+            + _MULTIPLIER_POINTS[bisect_right(_MULTIPLIER_THRESHOLDS, max_multiplier)]
+            + _AVG_ROI_POINTS[bisect_left(_AVG_ROI_THRESHOLDS, avg_roi)]
+            + _VOLUME_POINTS[bisect_left(_VOLUME_THRESHOLDS, total_volume_usd)]
+            + _TRADE_COUNT_POINTS[bisect_left(_TRADE_COUNT_THRESHOLDS, trade_count)]
+            + (10 if recent_activity > 0 else 0)
+        )
+    
     def _get_chain_name(self, chain_id: int) -> str:
         """Convert chain ID to name"""
-        chain_map = {
-            1: 'ethereum',
-            56: 'bsc',
-            137: 'polygon',
-            42161: 'arbitrum',
-            10: 'optimism'
-        }
-        return chain_map.get(chain_id, f'chain_{chain_id}')
+        return _CHAIN_NAMES.get(chain_id, f'chain_{chain_id}')
     
     async def close(self):
-        """Close aiohttp session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Close the shared aiohttp session"""
+        global _shared_session
+        if _shared_session and not _shared_session.closed:
+            await _shared_session.close()
+        _shared_session = None
 
 # Global Covalent client instance
 covalent_client = CovalentClient()
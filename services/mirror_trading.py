@@ -3,20 +3,46 @@
 Mirror Trading Service with Auto-Sell Logic
 """
 
+import heapq
 import logging
 import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
 from core.execution_engine import execution_engine
 from services.wallet_analyzer import wallet_analyzer
 from integrations.helius import helius_client
+from integrations.jupiter import jupiter_client
+from utils.cache import TTLCache
 from utils.key_manager import key_manager
-from db import get_db_session, WalletWatch, MirrorTrade
+from db import get_db_manager, MirrorTradeData
 
 logger = logging.getLogger(__name__)
 
+# Wallet polling backs off from MIN to MAX seconds while a wallet stays idle
+MIN_SCAN_INTERVAL = 5
+MAX_SCAN_INTERVAL = 300
+# Helius returns the last 5 minutes of activity, so faster polls see the same
+# transactions again; remember mirrored signatures a little longer than that
+SEEN_TX_TTL = 600
+SEEN_TX_MAXSIZE = 10_000
+
+# Mirror trade log batching: flush after this delay or once a batch is full
+LOG_FLUSH_INTERVAL = 0.2
+LOG_BATCH_SIZE = 50
+# Trades waiting for the writer; loggers wait for room rather than grow it unbounded
+LOG_QUEUE_MAXSIZE = 1000
+
+SOL_MINT = 'So11111111111111111111111111111111111111112'
+USDC_MINT = 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
+
+# Swaps out of these mints are buys, swaps into them are sells
+QUOTE_MINTS = frozenset({SOL_MINT, USDC_MINT})
+
 
 @dataclass
 class MirrorSettings:
@@ -27,6 +53,7 @@ class MirrorSettings:
     min_liquidity_usd: float = 10000.0
     max_slippage_percent: float = 5.0
     copy_percentage: float = 100.0  # % of watched wallet's position to copy
+    max_parallel_scans: int = 20  # Concurrent wallet activity checks per cycle
 
 
 class MirrorTradingService:
@@ -34,16 +61,25 @@ class MirrorTradingService:
     
     def __init__(self):
         self.settings = MirrorSettings()
+        self._slippage_bps = int(self.settings.max_slippage_percent * 100)
         self.watched_wallets: Set[str] = set()
         self.active_positions: Dict[str, Dict] = {}  # token_address -> position_data
         self.is_monitoring = False
         self.last_scan_time = datetime.utcnow()
+        self._scan_semaphore = asyncio.Semaphore(self.settings.max_parallel_scans)
+        self._log_queue: asyncio.Queue = asyncio.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+        self._log_task: Optional[asyncio.Task] = None
+        # sqlite3 calls block, so the writer runs them on one dedicated thread;
+        # a single worker also keeps writes and the final close in order
+        self._log_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mirror-log')
+        self._seen_txs = TTLCache(ttl=SEEN_TX_TTL, maxsize=SEEN_TX_MAXSIZE)
         
     async def start_mirror_trading(self, watched_wallets: List[str]):
         """Start monitoring watched wallets for mirror trading"""
         try:
             self.watched_wallets = set(watched_wallets)
             self.is_monitoring = True
+            self._ensure_log_flusher()
             
             logger.info(f"🪞 Starting mirror trading for {len(watched_wallets)} wallets")
             
@@ -57,34 +93,87 @@ class MirrorTradingService:
         """Stop mirror trading monitoring"""
         self.is_monitoring = False
         self.watched_wallets.clear()
+        
+        # Stop the writer (it writes its in-hand batch on cancel), then persist the rest
+        if self._log_task is not None:
+            self._log_task.cancel()
+            await asyncio.gather(self._log_task, return_exceptions=True)
+            self._log_task = None
+        await self._drain_log_queue()
         logger.info("🛑 Mirror trading stopped")
     
     async def monitor_watched_wallets(self):
         """Main monitoring loop for watched wallets"""
+        self._scan_semaphore = asyncio.Semaphore(self.settings.max_parallel_scans)
+        
+        # Min-heap of (next scan time, wallet); idle wallets back off exponentially
+        schedule: List[Tuple[float, str]] = []
+        intervals: Dict[str, float] = {}
+        
         while self.is_monitoring:
             try:
-                for wallet_address in self.watched_wallets:
-                    await self._check_wallet_activity(wallet_address)
-                    await asyncio.sleep(1)  # Rate limiting
+                now = time.monotonic()
+                for wallet in self.watched_wallets - intervals.keys():
+                    intervals[wallet] = MIN_SCAN_INTERVAL
+                    heapq.heappush(schedule, (now, wallet))
+                
+                # Sleep until the next wallet is due, waking regularly to pick up new wallets
+                delay = schedule[0][0] - now if schedule else MIN_SCAN_INTERVAL
+                if delay > 0:
+                    await asyncio.sleep(min(delay, MIN_SCAN_INTERVAL))
+                    continue
                 
-                # Check every 30 seconds
-                await asyncio.sleep(30)
+                due = []
+                while schedule and schedule[0][0] <= now:
+                    wallet = heapq.heappop(schedule)[1]
+                    if wallet in self.watched_wallets:
+                        due.append(wallet)
+                    else:
+                        intervals.pop(wallet, None)
+                
+                # Check due wallets concurrently; the semaphore does the rate limiting
+                results = await asyncio.gather(
+                    *(self._check_wallet_activity(wallet) for wallet in due),
+                    return_exceptions=True
+                )
+                
+                now = time.monotonic()
+                for wallet, active in zip(due, results):
+                    if active is True:
+                        intervals[wallet] = MIN_SCAN_INTERVAL
+                    else:
+                        intervals[wallet] = min(intervals[wallet] * 2, MAX_SCAN_INTERVAL)
+                    heapq.heappush(schedule, (now + intervals[wallet], wallet))
                 
             except Exception as e:
                 logger.error(f"Mirror trading monitoring error: {e}")
                 await asyncio.sleep(60)
     
-    async def _check_wallet_activity(self, wallet_address: str):
-        """Check individual wallet for new trading activity"""
+    async def _check_wallet_activity(self, wallet_address: str) -> bool:
+        """Check individual wallet for new trading activity, returning True if any was found"""
         try:
             # Get recent transactions
-            recent_txs = await helius_client.monitor_wallet_activity(wallet_address)
+            async with self._scan_semaphore:
+                recent_txs = await helius_client.monitor_wallet_activity(wallet_address)
             
+            # Activity windows overlap between polls, so skip transactions already mirrored
+            new_txs = []
             for tx in recent_txs:
+                signature = tx.get('signature')
+                if signature:
+                    if self._seen_txs.get(signature):
+                        logger.debug(f"Skipping already mirrored transaction {signature}")
+                        continue
+                    self._seen_txs.set(signature, True)
+                new_txs.append(tx)
+            
+            for tx in new_txs:
                 await self._process_mirror_transaction(tx, wallet_address)
+            return bool(new_txs)
                 
         except Exception as e:
             logger.error(f"Failed to check wallet activity {wallet_address}: {e}")
+            return False
     
     async def _process_mirror_transaction(self, transaction: Dict, source_wallet: str):
         """Process transaction for mirror trading"""
@@ -107,17 +196,13 @@ class MirrorTradingService:
     
     def _is_sell_transaction(self, transaction: Dict) -> bool:
         """Determine if transaction is a sell (token -> SOL/USDC)"""
-        output_mint = transaction.get('outputMint')
         # Check if output is SOL or USDC (common sell targets)
-        return output_mint in ['So11111111111111111111111111111111111111112', 
-                              'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v']
+        return transaction.get('outputMint') in QUOTE_MINTS
     
     def _is_buy_transaction(self, transaction: Dict) -> bool:
         """Determine if transaction is a buy (SOL/USDC -> token)"""
-        input_mint = transaction.get('inputMint')
         # Check if input is SOL or USDC
-        return input_mint in ['So11111111111111111111111111111111111111112',
-                             'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v']
+        return transaction.get('inputMint') in QUOTE_MINTS
     
     async def _handle_mirror_sell(self, transaction: Dict, source_wallet: str):
         """Handle mirror sell - auto-sell if we have position"""
@@ -174,10 +259,10 @@ class MirrorTradingService:
             trade_params = {
                 'chain': 'solana',
                 'input_mint': token_mint,
-                'output_mint': 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v',  # USDC
+                'output_mint': USDC_MINT,
                 'amount': int(position_size),
                 'wallet_keypair': position.get('wallet_keypair'),
-                'slippage_bps': int(self.settings.max_slippage_percent * 100)
+                'slippage_bps': self._slippage_bps
             }
             
             result = await execution_engine.execute_trade(trade_params)
@@ -198,35 +283,30 @@ class MirrorTradingService:
     
     async def _perform_safety_checks(self, token_mint: str) -> Dict:
         """Perform safety checks before executing trades"""
+        # Honeypot simulation and metadata lookup are independent, so run them together
+        simulation_task = asyncio.create_task(jupiter_client.simulate_swap(
+            USDC_MINT,
+            token_mint,
+            1000000  # 1 USDC
+        ))
+        metadata_task = asyncio.create_task(helius_client.get_token_metadata(token_mint))
+        pending = {simulation_task, metadata_task}
+        
         try:
-            # Honeypot check via Jupiter simulation
-            simulation = await jupiter_client.simulate_swap(
-                'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v',  # USDC
-                token_mint,
-                1000000  # 1 USDC
-            )
-            
-            if simulation.get('is_honeypot'):
-                return {
-                    'is_safe': False,
-                    'reason': 'Honeypot detected'
-                }
-            
-            # Price impact check
-            price_impact = simulation.get('price_impact', 0)
-            if price_impact > 10:  # 10% price impact
-                return {
-                    'is_safe': False,
-                    'reason': f'High price impact: {price_impact}%'
-                }
-            
-            # Liquidity check
-            token_metadata = await helius_client.get_token_metadata(token_mint)
-            if not token_metadata:
-                return {
-                    'is_safe': False,
-                    'reason': 'Token metadata not found'
-                }
+            # Fail fast on whichever check comes back bad first
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is simulation_task:
+                        reason = self._simulation_failure(task.result())
+                    else:
+                        # Liquidity check
+                        reason = None if task.result() else 'Token metadata not found'
+                    if reason:
+                        return {
+                            'is_safe': False,
+                            'reason': reason
+                        }
             
             return {
                 'is_safe': True,
@@ -239,6 +319,20 @@ class MirrorTradingService:
                 'is_safe': False,
                 'reason': f'Safety check error: {e}'
             }
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _simulation_failure(self, simulation: Dict) -> Optional[str]:
+        """Reason a Jupiter swap simulation fails the safety gate, or None if it passes"""
+        if simulation.get('is_honeypot'):
+            return 'Honeypot detected'
+        
+        # Price impact check
+        price_impact = simulation.get('price_impact', 0)
+        if price_impact > 10:  # 10% price impact
+            return f'High price impact: {price_impact}%'
+        return None
     
     async def _send_buy_alert(self, token_mint: str, source_wallet: str, amount_usd: float):
         """Send buy alert to user"""
@@ -276,28 +370,64 @@ class MirrorTradingService:
             logger.error(f"Failed to send sell alert: {e}")
     
     async def _log_mirror_trade(self, token_mint: str, action: str, result: Dict, source_wallet: str):
-        """Log mirror trade to database"""
+        """Queue a mirror trade for the background database writer"""
+        mirror_trade = MirrorTradeData(
+            source_wallet=source_wallet,
+            token_address=token_mint,
+            action=action,
+            tx_hash=result.get('tx_hash'),
+            amount_usd=result.get('amount_usd', 0),
+            timestamp=int(time.time()),
+            success=bool(result.get('success', False)),
+            error_message=result.get('error')
+        )
+        self._ensure_log_flusher()
+        await self._log_queue.put(mirror_trade)
+    
+    def _ensure_log_flusher(self):
+        """Start the background mirror trade writer if it isn't running"""
+        if self._log_task is None or self._log_task.done():
+            self._log_task = asyncio.create_task(self._log_flusher())
+    
+    async def _log_flusher(self):
+        """Write queued mirror trades to the database in batches"""
+        db_manager = get_db_manager()
+        loop = asyncio.get_running_loop()
+        
+        # One long-lived connection for the writer; each batch is its own transaction
+        conn = None
         try:
-            db = next(get_db_session())
-            
-            mirror_trade = MirrorTrade(
-                source_wallet=source_wallet,
-                token_address=token_mint,
-                action=action,
-                tx_hash=result.get('tx_hash'),
-                amount_usd=result.get('amount_usd', 0),
-                timestamp=datetime.utcnow(),
-                success=result.get('success', False),
-                error_message=result.get('error')
+            conn = await loop.run_in_executor(
+                self._log_executor,
+                lambda: sqlite3.connect(db_manager.db_path, check_same_thread=False)
             )
-            
-            db.add(mirror_trade)
-            db.commit()
-            
-        except Exception as e:
-            logger.error(f"Failed to log mirror trade: {e}")
+        except sqlite3.Error as e:
+            logger.error(f"Mirror trade writer could not open the database, connecting per batch: {e}")
+        
+        try:
+            while True:
+                batch = [await self._log_queue.get()]
+                try:
+                    # Give a burst of trades a moment to accumulate into one commit
+                    await asyncio.sleep(LOG_FLUSH_INTERVAL)
+                finally:
+                    # Also runs on cancellation so a dequeued batch is never dropped
+                    while len(batch) < LOG_BATCH_SIZE and not self._log_queue.empty():
+                        batch.append(self._log_queue.get_nowait())
+                    await loop.run_in_executor(self._log_executor, db_manager.add_mirror_trades, batch, conn)
         finally:
-            db.close()
+            if conn is not None:
+                await loop.run_in_executor(self._log_executor, conn.close)
+    
+    async def _drain_log_queue(self):
+        """Write any mirror trades still waiting in the queue"""
+        batch = []
+        while not self._log_queue.empty():
+            batch.append(self._log_queue.get_nowait())
+        if batch:
+            await asyncio.get_running_loop().run_in_executor(
+                self._log_executor, get_db_manager().add_mirror_trades, batch
+            )
     
     def update_settings(self, **kwargs):
         """Update mirror trading settings"""
@@ -305,6 +435,7 @@ class MirrorTradingService:
             if hasattr(self.settings, key):
                 setattr(self.settings, key, value)
                 logger.info(f"Updated mirror setting {key}: {value}")
+        self._slippage_bps = int(self.settings.max_slippage_percent * 100)
 
 
 # Global mirror trading service
@@ -4,12 +4,19 @@ Mock data source for testing when APIs are blocked
 
 import random
 import logging
+import zlib
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4096)
+def _address_hash(address: str) -> int:
+    """Stable 0-999 bucket for an address (builtin hash() is salted per process)"""
+    return zlib.crc32(address.encode()) % 1000
+
 @dataclass
 class MockTransaction:
     """Mock transaction data"""
@@ -57,26 +64,25 @@ class MockDataProvider:
     
     def get_mock_recent_transactions(self, chain_id: int, limit: int = 1000) -> List[Dict[str, Any]]:
         """Generate mock recent transactions"""
-        transactions = []
+        n = min(limit, 500)  # Limit to 500 for performance
+        now = datetime.now()
+        day_timestamps = [int((now - timedelta(days=days)).timestamp()) for days in range(31)]
         
-        for i in range(min(limit, 500)):  # Limit to 500 for performance
-            # Random addresses
-            from_addr = random.choice(self.test_wallets)
-            to_addr = random.choice(self.test_wallets)
-            
-            # Avoid self-transfers
-            while to_addr == from_addr:
-                to_addr = random.choice(self.test_wallets)
-            
-            transaction = {
-                'hash': f"0x{''.join(random.choices('0123456789abcdef', k=64))}",
+        transactions = [
+            {
+                'hash': f"0x{random.getrandbits(256):064x}",
                 'from_address': from_addr,
                 'to_address': to_addr,
                 'value_usd': random.uniform(100, 100000),
-                'token_symbol': random.choice(self.token_symbols),
-                'timestamp': int((datetime.now() - timedelta(days=random.randint(0, 30))).timestamp())
+                'token_symbol': symbol,
+                'timestamp': day_timestamps[random.randint(0, 30)]
             }
-            transactions.append(transaction)
+            # Random distinct addresses (no self-transfers)
+            for (from_addr, to_addr), symbol in zip(
+                (random.sample(self.test_wallets, 2) for _ in range(n)),
+                random.choices(self.token_symbols, k=n)
+            )
+        ]
         
         logger.info(f"Generated {len(transactions)} mock transactions for chain {chain_id}")
         return transactions
@@ -87,12 +93,11 @@ class MockDataProvider:
         
         # Generate 20-100 transactions for the wallet
         num_txs = random.randint(20, 100)
+        counterparties = [wallet for wallet in self.test_wallets if wallet != address]
         
         for i in range(num_txs):
             # Random counterparty
-            counterparty = random.choice(self.test_wallets)
-            while counterparty == address:
-                counterparty = random.choice(self.test_wallets)
+            counterparty = random.choice(counterparties)
             
             # Random direction (buy/sell)
             is_buy = random.choice([True, False])
@@ -100,7 +105,7 @@ class MockDataProvider:
             to_addr = address if is_buy else counterparty
             
             transaction = MockTransaction(
-                hash=f"0x{''.join(random.choices('0123456789abcdef', k=64))}",
+                hash=f"0x{random.getrandbits(256):064x}",
                 from_address=from_addr,
                 to_address=to_addr,
                 value_usd=random.uniform(1000, 50000),
@@ -114,27 +119,12 @@ class MockDataProvider:
     
     def get_mock_wallet_metrics(self, address: str, chain_id: int) -> MockWalletMetrics:
         """Generate mock wallet metrics"""
-        # Generate realistic metrics based on address hash for consistency
-        address_hash = hash(address) % 1000
-        
-        # Score between 50-95
-        score = 50 + (address_hash % 45)
-        
-        # Win rate between 60-90%
-        win_rate = 60 + (address_hash % 30)
-        
-        # Max multiplier between 2x-50x
-        max_multiplier = 2 + (address_hash % 48)
-        
-        # Avg ROI between 10-200%
-        avg_roi = 10 + (address_hash % 190)
-        
-        # Volume between $10k-$1M
-        total_volume_usd = 10000 + (address_hash * 1000)
-        
-        # Recent activity (days since last trade)
-        recent_activity = max(1, 30 - (address_hash % 30))
-        
+        metrics = self._metrics_for_hash(_address_hash(address))
+        logger.info(f"Generated mock metrics for {address}: score={metrics.score}, win_rate={metrics.win_rate}%")
+        return metrics
+    
+    def _metrics_for_hash(self, address_hash: int) -> MockWalletMetrics:
+        """Derive realistic metrics from an address hash so results are consistent"""
         # Risk flags (some wallets have risks)
         risk_flags = []
         if address_hash % 10 == 0:
@@ -142,18 +132,15 @@ class MockDataProvider:
         if address_hash % 15 == 0:
             risk_flags.append('new_wallet')
         
-        metrics = MockWalletMetrics(
-            score=score,
-            win_rate=win_rate,
-            max_multiplier=max_multiplier,
-            avg_roi=avg_roi,
-            total_volume_usd=total_volume_usd,
-            recent_activity=recent_activity,
+        return MockWalletMetrics(
+            score=50 + (address_hash % 45),  # 50-95
+            win_rate=60 + (address_hash % 30),  # 60-90%
+            max_multiplier=2 + (address_hash % 48),  # 2x-50x
+            avg_roi=10 + (address_hash % 190),  # 10-200%
+            total_volume_usd=10000 + (address_hash * 1000),  # $10k-$1M
+            recent_activity=max(1, 30 - (address_hash % 30)),  # Days since last trade
             risk_flags=risk_flags
         )
-        
-        logger.info(f"Generated mock metrics for {address}: score={score}, win_rate={win_rate}%")
-        return metrics
     
     def get_mock_token_holders(self, token_address: str, chain_id: int) -> List[Dict[str, Any]]:
         """Generate mock token holders"""
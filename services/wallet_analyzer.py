@@ -5,23 +5,83 @@ Comprehensive Wallet & Token Analyzer with Deep Graph Scanning
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import os
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, List, Set, Optional, Any, Tuple
 from dataclasses import dataclass
 from web3 import Web3
 import networkx as nx
 from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 import hashlib
+import heapq
 
 from integrations.base import integration_manager
 from integrations.covalent import CovalentClient
 from integrations.goplus import GoPlusClient
 from utils.api_client import APIClient
-from db import get_db_session, WalletWatch, ExecutorWallet
+from config import Config
+from db import get_db_session
 from core.wallet_manager import wallet_manager
+from utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Cheap shape check run before the checksum-aware Web3 validator
+_ADDR_RE = re.compile(r'(?:0x)?[0-9a-fA-F]{40}')
+
+# Concurrent Covalent transfer fetches per graph BFS level
+GRAPH_FETCH_CONCURRENCY = 5
+
+# Known CEX addresses (sample), lowercase for case-insensitive membership checks
+KNOWN_CEX_ADDRESSES = frozenset({
+    '0xd551234ae421e3bcba99a0da6d736074f22192ff',  # Binance
+    '0x3cd751e6b0078be393132286c442345e5dc49699',  # Binance
+    '0x28c6c06298d514db089934071355e5743bf21d60',  # Binance
+    '0x21a31ee1afc51d94c2efccaa2092ad1028285549',  # Binance
+    '0x56eddb7aa87536c09ccc2793473599fd21a8b17f'   # Binance
+})
+
+# Chain IDs by lowercase chain name
+CHAIN_IDS = {
+    'ethereum': 1,
+    'bsc': 56,
+    'polygon': 137,
+    'arbitrum': 42161,
+    'optimism': 10
+}
+
+# Risk score contribution of each token risk flag
+TOKEN_RISK_FLAG_WEIGHTS = {
+    'HONEYPOT': 50,
+    'LOW_LIQUIDITY': 20,
+    'LIQUIDITY_RISK': 15,
+    'DEV_CONTROL': 15,
+    'UNVERIFIED_CODE': 10,
+    'HIGH_TAX': 20
+}
+
+# Seconds a fetched transfer list is reused across scans, analyses and restarts
+TRANSFERS_CACHE_TTL = 300
+TRANSFERS_CACHE_PATH = os.path.join(Config.CACHE_DIR, 'wallet_transfers.sqlite')
+
+# Trading history and counterparty scans share one page of the analyzed wallet's transfers;
+# counterparties only read the most recent slice of it
+ROOT_TRANSFERS_PAGE_SIZE = 1000
+COUNTERPARTY_TRANSFERS_LIMIT = 500
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso_timestamp(value: str) -> float:
+    """Parse a Covalent ISO timestamp to UTC epoch seconds, treating naive values as UTC"""
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
 
 @dataclass
 class WalletScore:
@@ -90,17 +150,12 @@ class WalletAnalyzer:
             self.goplus_client = None
             logger.warning(f"Failed to initialize GoPlus client: {e}")
         
-        self.cache = {}
         self.cache_ttl = 600  # 10 minutes
+        self.cache = TTLCache(ttl=self.cache_ttl, maxsize=4096)
+        self._transfers_cache: Optional[TTLCache] = None  # Opened on first use
+        self._transfers_inflight: Dict[Tuple, asyncio.Task] = {}
         
-        # Known CEX addresses (sample)
-        self.known_cex_addresses = {
-            '0xd551234ae421e3bcba99a0da6d736074f22192ff',  # Binance
-            '0x3cd751e6b0078be393132286c442345e5dc49699',  # Binance
-            '0x28c6c06298d514db089934071355e5743bf21d60',  # Binance
-            '0x21a31ee1afc51d94c2efccaa2092ad1028285549',  # Binance
-            '0x56eddb7aa87536c09ccc2793473599fd21a8b17f'   # Binance
-        }
+        self.known_cex_addresses = KNOWN_CEX_ADDRESSES
         
     async def analyze_wallet(self, address: str, chain: str = 'ethereum', depth: int = 3) -> Dict:
         """
@@ -118,32 +173,38 @@ class WalletAnalyzer:
             logger.info(f"🔍 Starting wallet analysis: {address} (depth={depth})")
             
             # Validate address
-            if not Web3.is_address(address):
+            if not _ADDR_RE.fullmatch(address) or not Web3.is_address(address):
                 raise ValueError("Invalid wallet address format")
             
             # Check cache first
-            cache_key = f"wallet_{address}_{chain}_{depth}"
-            if cache_key in self.cache:
-                cached_data, timestamp = self.cache[cache_key]
-                if datetime.utcnow() - timestamp < timedelta(seconds=self.cache_ttl):
-                    logger.info(f"📋 Returning cached analysis for {address}")
-                    return cached_data
-            
-            # Get basic wallet data
-            wallet_data = await self._get_wallet_basic_data(address, chain)
-            
-            # Analyze trading history
-            trading_metrics = await self._analyze_trading_history(address, chain)
+            cache_key = ('wallet', address, chain, depth)
+            cached_data = self.cache.get(cache_key)
+            if cached_data is not None:
+                logger.info(f"📋 Returning cached analysis for {address}")
+                return cached_data
+            
+            # Basic data, trading history, graph and counterparties are independent
+            wallet_data, trading_metrics, graph_metrics, top_counterparties = await asyncio.gather(
+                self._get_wallet_basic_data(address, chain),
+                self._analyze_trading_history(address, chain),
+                self._analyze_wallet_graph(address, chain, depth),
+                self._get_top_counterparties(address, chain)
+            )
             
-            # Perform graph analysis
-            graph_metrics = await self._analyze_wallet_graph(address, chain, depth)
+            # One batched security lookup covers every token among the wallet's top trades
+            top_tokens = trading_metrics.get('top_tokens', [])
+            honeypots = await self._detect_honeypots(
+                [token['contract'] for token in top_tokens if token.get('contract')], chain
+            )
+            for token in top_tokens:
+                verdict = honeypots.get((token.get('contract') or '').lower())
+                # A failed lookup says nothing about the token, so only real verdicts count
+                token['is_honeypot'] = bool(verdict and verdict['is_honeypot'] and verdict['source'] != 'error')
+            honeypot_interactions = sum(token['is_honeypot'] for token in top_tokens)
             
             # Calculate wallet score
             wallet_score = self._calculate_wallet_score(wallet_data, trading_metrics, graph_metrics)
             
-            # Get top counterparties
-            top_counterparties = await self._get_top_counterparties(address, chain)
-            
             # Compile results
             analysis_result = {
                 'address': address,
@@ -157,7 +218,8 @@ class WalletAnalyzer:
                 'tokens_traded': wallet_score.tokens_traded,
                 'last_activity': wallet_score.last_activity.isoformat() if wallet_score.last_activity else None,
                 'total_volume_usd': wallet_score.total_volume_usd,
-                'top_tokens': trading_metrics.get('top_tokens', []),
+                'top_tokens': top_tokens,
+                'honeypot_interactions': honeypot_interactions,
                 'top_counterparties': top_counterparties,
                 'graph_metrics': graph_metrics,
                 'wallet_data': wallet_data,
@@ -165,7 +227,7 @@ class WalletAnalyzer:
             }
             
             # Cache results
-            self.cache[cache_key] = (analysis_result, datetime.utcnow())
+            self.cache.set(cache_key, analysis_result)
             
             logger.info(f"✅ Wallet analysis completed: {address} (score: {wallet_score.score})")
             return analysis_result
@@ -189,15 +251,14 @@ class WalletAnalyzer:
             logger.info(f"🔍 Starting token analysis: {contract_address}")
             
             # Validate contract address
-            if not Web3.is_address(contract_address):
+            if not _ADDR_RE.fullmatch(contract_address) or not Web3.is_address(contract_address):
                 raise ValueError("Invalid contract address format")
             
             # Check cache
-            cache_key = f"token_{contract_address}_{chain}"
-            if cache_key in self.cache:
-                cached_data, timestamp = self.cache[cache_key]
-                if datetime.utcnow() - timestamp < timedelta(seconds=self.cache_ttl):
-                    return cached_data
+            cache_key = ('token', contract_address, chain)
+            cached_data = self.cache.get(cache_key)
+            if cached_data is not None:
+                return cached_data
             
             # Get basic token data
             token_data = await self._get_token_basic_data(contract_address, chain)
@@ -232,7 +293,7 @@ class WalletAnalyzer:
             }
             
             # Cache results
-            self.cache[cache_key] = (analysis_result, datetime.utcnow())
+            self.cache.set(cache_key, analysis_result)
             
             logger.info(f"✅ Token analysis completed: {contract_address}")
             return analysis_result
@@ -246,14 +307,14 @@ class WalletAnalyzer:
         try:
             chain_id = self._get_chain_id(chain)
             
-            # Get balance
-            balance_data = await self.covalent_client.get_token_balances(chain_id, address)
-            
-            # Get transaction count
-            tx_count = await self.covalent_client.get_transaction_count(chain_id, address)
+            # Balance, transaction count and code lookups in one round
+            balance_data, tx_count, code = await asyncio.gather(
+                self.covalent_client.get_token_balances(chain_id, address),
+                self.covalent_client.get_transaction_count(chain_id, address),
+                self.covalent_client.get_code(chain_id, address)
+            )
             
             # Check if it's a contract
-            code = await self.covalent_client.get_code(chain_id, address)
             is_contract = len(code) > 2
             
             return {
@@ -282,7 +343,7 @@ class WalletAnalyzer:
             chain_id = self._get_chain_id(chain)
             
             # Get recent transfers
-            transfers = await self.covalent_client.get_transfers(chain_id, address, page_size=1000)
+            transfers = await self._cached_get_transfers(chain_id, address, ROOT_TRANSFERS_PAGE_SIZE)
             
             # Analyze trades
             trades = self._extract_trades_from_transfers(transfers)
@@ -350,64 +411,60 @@ class WalletAnalyzer:
     def _extract_trades_from_transfers(self, transfers: List[Dict]) -> List[Dict]:
         """Extract completed trades from transfer history"""
         trades = []
-        token_positions = defaultdict(list)
         
         try:
-            # Group transfers by token
-            for transfer in transfers:
-                token_address = transfer.get('contract_address')
-                if token_address:
-                    token_positions[token_address].append(transfer)
+            # One sort by token then timestamp, so each token's transfers come out contiguous and in order
+            token_transfers_sorted = sorted(
+                (transfer for transfer in transfers if transfer.get('contract_address')),
+                key=lambda x: (x['contract_address'], x.get('block_signed_at', ''))
+            )
             
             # Analyze each token's trading history
-            for token_address, token_transfers in token_positions.items():
-                # Sort by timestamp
-                token_transfers.sort(key=lambda x: x.get('block_signed_at', ''))
-                
+            for token_address, token_transfers in groupby(token_transfers_sorted, key=itemgetter('contract_address')):
                 # Match buys and sells
                 position = 0
                 buy_price = 0
                 buy_tx = None
                 buy_time = None
+                buy_ts = None  # Parsed lazily, once per open position
                 
                 for transfer in token_transfers:
-                    value = float(transfer.get('value', 0))
-                    quote_rate = float(transfer.get('quote_rate', 0))
+                    get = transfer.get
+                    transfer_type = get('transfer_type')
                     
-                    if transfer.get('transfer_type') == 'IN':
+                    if transfer_type == 'IN':
                         # Buy
                         if position == 0:
-                            buy_price = quote_rate
-                            buy_tx = transfer.get('tx_hash')
-                            buy_time = transfer.get('block_signed_at')
-                        position += value
+                            buy_price = float(get('quote_rate', 0))
+                            buy_tx = get('tx_hash')
+                            buy_time = get('block_signed_at')
+                            buy_ts = None
+                        position += float(get('value', 0))
                     
-                    elif transfer.get('transfer_type') == 'OUT' and position > 0:
+                    elif transfer_type == 'OUT' and position > 0:
                         # Sell
-                        sell_price = quote_rate
-                        sell_tx = transfer.get('tx_hash')
-                        sell_time = transfer.get('block_signed_at')
+                        value = float(get('value', 0))
+                        sell_price = float(get('quote_rate', 0))
                         
                         if buy_price > 0 and sell_price > 0:
-                            profit_multiplier = sell_price / buy_price
-                            profit_usd = (sell_price - buy_price) * value
+                            sell_time = get('block_signed_at')
                             
                             # Calculate hold time
                             hold_time_hours = 0
                             if buy_time and sell_time:
-                                buy_dt = datetime.fromisoformat(buy_time.replace('Z', '+00:00'))
-                                sell_dt = datetime.fromisoformat(sell_time.replace('Z', '+00:00'))
-                                hold_time_hours = (sell_dt - buy_dt).total_seconds() / 3600
+                                if buy_ts is None:
+                                    buy_ts = _parse_iso_timestamp(buy_time)
+                                hold_time_hours = (_parse_iso_timestamp(sell_time) - buy_ts) / 3600
                             
                             trades.append({
                                 'token_address': token_address,
-                                'token_symbol': transfer.get('contract_ticker_symbol', 'Unknown'),
+                                'token_symbol': get('contract_ticker_symbol', 'Unknown'),
                                 'buy_tx': buy_tx,
-                                'sell_tx': sell_tx,
+                                'sell_tx': get('tx_hash'),
                                 'buy_usd': buy_price * value,
                                 'sell_usd': sell_price * value,
-                                'profit_usd': profit_usd,
-                                'profit_multiplier': profit_multiplier,
+                                'profit_usd': (sell_price - buy_price) * value,
+                                'profit_multiplier': sell_price / buy_price,
                                 'hold_time_hours': hold_time_hours
                             })
                         
@@ -426,46 +483,65 @@ class WalletAnalyzer:
             
             graph = nx.DiGraph()
             visited = set()
-            to_visit = [(address, 0)]  # (address, current_depth)
             breadth_limit = 200
             
             chain_id = self._get_chain_id(chain)
-            
-            while to_visit and len(visited) < breadth_limit:
-                current_address, current_depth = to_visit.pop(0)
-                
-                if current_address in visited or current_depth >= depth:
-                    continue
-                
-                visited.add(current_address)
-                
-                # Get transfers for this address
-                transfers = await self.covalent_client.get_transfers(
-                    chain_id, current_address, page_size=100
-                )
-                
-                # Add connections to graph
-                counterparties = set()
-                for transfer in transfers:
-                    from_addr = transfer.get('from_address')
-                    to_addr = transfer.get('to_address')
-                    value_usd = float(transfer.get('value_quote', 0))
+            semaphore = asyncio.Semaphore(GRAPH_FETCH_CONCURRENCY)
+            
+            async def fetch_transfers(node: str) -> Tuple[str, Optional[List[Dict]]]:
+                async with semaphore:
+                    try:
+                        return node, await self._cached_get_transfers(chain_id, node, 100)
+                    except Exception as e:
+                        logger.warning(f"Skipping graph node {node}: {e}")
+                        return node, None
+            
+            def start_fetch(node: str) -> asyncio.Task:
+                visited.add(node)
+                task = asyncio.create_task(fetch_transfers(node))
+                tasks.append(task)
+                return task
+            
+            tasks: List[asyncio.Task] = []
+            try:
+                level = [start_fetch(address)] if depth > 0 else []
+                current_depth = 1
+                while level:
+                    expand = current_depth < depth
+                    next_level = []
                     
-                    if from_addr and to_addr:
-                        graph.add_edge(from_addr, to_addr, weight=value_usd)
+                    # Handle nodes as their fetches land; the next level's fetches start
+                    # right away and overlap with edge building for the rest of this level
+                    for next_result in asyncio.as_completed(level):
+                        current_address, transfers = await next_result
+                        if transfers is None:
+                            continue
                         
-                        if current_address == from_addr:
-                            counterparties.add(to_addr)
-                        elif current_address == to_addr:
-                            counterparties.add(from_addr)
-                
-                # Add counterparties to visit list
-                for counterparty in counterparties:
-                    if counterparty not in visited and current_depth + 1 < depth:
-                        to_visit.append((counterparty, current_depth + 1))
-                
-                # Rate limiting
-                await asyncio.sleep(0.1)
+                        # Add connections to graph
+                        counterparties = set()
+                        for transfer in transfers:
+                            from_addr = transfer.get('from_address')
+                            to_addr = transfer.get('to_address')
+                            value_usd = float(transfer.get('value_quote', 0))
+                            
+                            if from_addr and to_addr:
+                                graph.add_edge(from_addr, to_addr, weight=value_usd)
+                                
+                                if current_address == from_addr:
+                                    counterparties.add(to_addr)
+                                elif current_address == to_addr:
+                                    counterparties.add(from_addr)
+                        
+                        if expand:
+                            for counterparty in counterparties:
+                                if counterparty not in visited and len(visited) < breadth_limit:
+                                    next_level.append(start_fetch(counterparty))
+                    
+                    level = next_level
+                    current_depth += 1
+            finally:
+                for task in tasks:
+                    task.cancel()
             
             # Calculate graph metrics
             metrics = self._calculate_graph_metrics(graph, address)
@@ -490,22 +566,13 @@ class WalletAnalyzer:
             # Basic metrics
             cluster_size = len(graph.nodes())
             
-            # Centrality measures
+            # Degree centrality of the address alone, without scoring every node
             centrality = 0.0
-            if address in graph.nodes():
-                centrality = nx.degree_centrality(graph).get(address, 0.0)
+            if address in graph:
+                centrality = graph.degree(address) / (cluster_size - 1) if cluster_size > 1 else 1.0
             
-            # Connected components
-            undirected = graph.to_undirected()
-            components = list(nx.connected_components(undirected))
-            connected_components = len(components)
-            
-            # Find address's component
-            address_component = None
-            for component in components:
-                if address in component:
-                    address_component = component
-                    break
+            # Weak components match the undirected view without copying the graph
+            connected_components = nx.number_weakly_connected_components(graph)
             
             # Funding sources (incoming edges)
             funding_sources = graph.in_degree(address) if address in graph.nodes() else 0
@@ -516,20 +583,15 @@ class WalletAnalyzer:
             # Top connections by transaction volume
             top_connections = []
             if address in graph.nodes():
-                neighbors = list(graph.neighbors(address)) + list(graph.predecessors(address))
-                neighbor_volumes = []
-                
-                for neighbor in set(neighbors):
-                    total_volume = 0
-                    if graph.has_edge(address, neighbor):
-                        total_volume += graph[address][neighbor].get('weight', 0)
-                    if graph.has_edge(neighbor, address):
-                        total_volume += graph[neighbor][address].get('weight', 0)
-                    
-                    neighbor_volumes.append((neighbor, total_volume))
+                # Sum volume in both directions with one pass over each edge list
+                volumes = defaultdict(float)
+                for _, neighbor, weight in graph.out_edges(address, data='weight', default=0):
+                    volumes[neighbor] += weight
+                for neighbor, _, weight in graph.in_edges(address, data='weight', default=0):
+                    volumes[neighbor] += weight
                 
-                # Sort by volume and take top 10
-                neighbor_volumes.sort(key=lambda x: x[1], reverse=True)
+                # Top 10 by volume
+                neighbor_volumes = heapq.nlargest(10, volumes.items(), key=itemgetter(1))
                 top_connections = [
                     {
                         'address': addr,
@@ -537,7 +599,7 @@ class WalletAnalyzer:
                         'is_cex': addr.lower() in self.known_cex_addresses,
                         'relationship': 'counterparty'
                     }
-                    for addr, volume in neighbor_volumes[:10]
+                    for addr, volume in neighbor_volumes
                 ]
             
             return {
@@ -586,14 +648,15 @@ class WalletAnalyzer:
         """Get top counterparties by transaction volume"""
         try:
             chain_id = self._get_chain_id(chain)
-            transfers = await self.covalent_client.get_transfers(chain_id, address, page_size=500)
+            transfers = await self._cached_get_transfers(chain_id, address, ROOT_TRANSFERS_PAGE_SIZE)
+            transfers = transfers[:COUNTERPARTY_TRANSFERS_LIMIT]
             
             counterparty_volumes = defaultdict(float)
             
             for transfer in transfers:
-                from_addr = transfer.get('from_address')
-                to_addr = transfer.get('to_address')
-                value_usd = float(transfer.get('value_quote', 0))
+                get = transfer.get
+                from_addr = get('from_address')
+                to_addr = get('to_address')
                 
                 counterparty = None
                 if from_addr == address:
@@ -601,15 +664,12 @@ class WalletAnalyzer:
                 elif to_addr == address:
                     counterparty = from_addr
                 
+                # Only rows that involve the address need their value parsed
                 if counterparty:
-                    counterparty_volumes[counterparty] += value_usd
+                    counterparty_volumes[counterparty] += float(get('value_quote', 0))
             
-            # Sort by volume and take top 10
-            sorted_counterparties = sorted(
-                counterparty_volumes.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]
+            # Top 10 by volume
+            sorted_counterparties = heapq.nlargest(10, counterparty_volumes.items(), key=itemgetter(1))
             
             return [
                 {
@@ -781,36 +841,61 @@ class WalletAnalyzer:
                 goplus_result = await self.goplus_client.check_token_security(
                     self._get_chain_id(chain), contract_address
                 )
-                if goplus_result:
-                    return {
-                        'is_honeypot': goplus_result.get('is_honeypot', False),
-                        'simulation_passed': not goplus_result.get('is_honeypot', False),
-                        'error_message': None,
-                        'buy_tax': goplus_result.get('buy_tax', 0),
-                        'sell_tax': goplus_result.get('sell_tax', 0),
-                        'source': 'goplus'
-                    }
+                return self._honeypot_result(goplus_result)
             
-            # Fallback to simulation (would implement eth_call simulation)
-            return {
-                'is_honeypot': False,
-                'simulation_passed': True,
-                'error_message': None,
-                'buy_tax': 0,
-                'sell_tax': 0,
-                'source': 'simulation'
-            }
+            return self._honeypot_result(None)
             
         except Exception as e:
             logger.error(f"Honeypot detection failed: {e}")
+            return self._honeypot_error(e)
+    
+    async def _detect_honeypots(self, contract_addresses: List[str], chain: str) -> Dict[str, Dict]:
+        """Detect honeypots for many tokens with batched GoPlus lookups; keys are lowercased addresses"""
+        addresses = [contract_address.lower() for contract_address in contract_addresses]
+        try:
+            goplus_results = {}
+            if self.goplus_client:
+                goplus_results = await self.goplus_client.check_token_security_batch(
+                    self._get_chain_id(chain), addresses
+                )
+            return {address: self._honeypot_result(goplus_results.get(address)) for address in addresses}
+            
+        except Exception as e:
+            logger.error(f"Batch honeypot detection failed: {e}")
+            return {address: self._honeypot_error(e) for address in addresses}
+    
+    def _honeypot_result(self, goplus_result: Optional[Dict]) -> Dict:
+        """Build a honeypot verdict from a GoPlus result, or the simulation fallback"""
+        if goplus_result:
             return {
-                'is_honeypot': True,  # Conservative assumption on error
-                'simulation_passed': False,
-                'error_message': str(e),
-                'buy_tax': 0,
-                'sell_tax': 0,
-                'source': 'error'
+                'is_honeypot': goplus_result.get('is_honeypot', False),
+                'simulation_passed': not goplus_result.get('is_honeypot', False),
+                'error_message': None,
+                'buy_tax': goplus_result.get('buy_tax', 0),
+                'sell_tax': goplus_result.get('sell_tax', 0),
+                'source': 'goplus'
             }
+        
+        # Fallback to simulation (would implement eth_call simulation)
+        return {
+            'is_honeypot': False,
+            'simulation_passed': True,
+            'error_message': None,
+            'buy_tax': 0,
+            'sell_tax': 0,
+            'source': 'simulation'
+        }
+    
+    def _honeypot_error(self, error: Exception) -> Dict:
+        """Honeypot verdict when detection itself failed"""
+        return {
+            'is_honeypot': True,  # Conservative assumption on error
+            'simulation_passed': False,
+            'error_message': str(error),
+            'buy_tax': 0,
+            'sell_tax': 0,
+            'source': 'error'
+        }
     
     async def _analyze_token_ownership(self, contract_address: str, chain: str) -> Dict:
         """Analyze token ownership and concentration"""
@@ -859,16 +944,7 @@ class WalletAnalyzer:
     
     def _calculate_token_risk_score(self, risk_flags: List[str]) -> int:
         """Calculate token risk score (0-100)"""
-        flag_weights = {
-            'HONEYPOT': 50,
-            'LOW_LIQUIDITY': 20,
-            'LIQUIDITY_RISK': 15,
-            'DEV_CONTROL': 15,
-            'UNVERIFIED_CODE': 10,
-            'HIGH_TAX': 20
-        }
-        
-        score = sum(flag_weights.get(flag, 0) for flag in risk_flags)
+        score = sum(TOKEN_RISK_FLAG_WEIGHTS.get(flag, 0) for flag in risk_flags)
         return min(100, score)
     
     def _get_token_recommendation(self, risk_flags: List[str]) -> str:
@@ -903,159 +979,47 @@ class WalletAnalyzer:
         
         return flags
     
+    async def _cached_get_transfers(self, chain_id: int, address: str, page_size: int) -> List[Dict]:
+        """Fetch transfers once per key, sharing in-flight requests between callers"""
+        key = (chain_id, address.lower(), page_size)
+        # Empty entries can only be failed fetches persisted by older builds; refetch them
+        transfers = self._get_transfers_cache().get(key)
+        if transfers:
+            return transfers
+        
+        task = self._transfers_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self.covalent_client.get_transfers(chain_id, address, page_size=page_size)
+            )
+            self._transfers_inflight[key] = task
+            task.add_done_callback(lambda done: self._store_transfers(key, done))
+        
+        # Shield so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+    
+    def _store_transfers(self, key: Tuple, task: asyncio.Task):
+        """Cache a finished transfers fetch and clear its in-flight entry"""
+        self._transfers_inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        # The client reports API errors as an empty list, so only real results are cached
+        transfers = task.result()
+        if transfers:
+            self._get_transfers_cache().set(key, transfers)
+    
+    def _get_transfers_cache(self) -> TTLCache:
+        """Open the persisted transfers cache on first use, not at import"""
+        if self._transfers_cache is None:
+            self._transfers_cache = TTLCache(
+                ttl=TRANSFERS_CACHE_TTL, persist_path=TRANSFERS_CACHE_PATH, maxsize=4096
+            )
+        return self._transfers_cache
+    
     def _get_chain_id(self, chain: str) -> int:
         """Get chain ID for chain name"""
-        chain_ids = {
-            'ethereum': 1,
-            'bsc': 56,
-            'polygon': 137,
-            'arbitrum': 42161,
-            'optimism': 10
-        }
-        return chain_ids.get(chain.lower(), 1)
+        return CHAIN_IDS.get(chain.lower(), 1)
 
 
 # Global analyzer instance
 wallet_analyzer = WalletAnalyzer()
-"""
-Wallet Analyzer Service for Meme Trader V4 Pro
-"""
-
-import logging
-import asyncio
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import random
-
-logger = logging.getLogger(__name__)
-
-class WalletAnalyzer:
-    """Comprehensive wallet analysis service"""
-    
-    def __init__(self):
-        self.cache = {}
-        self.cache_ttl = 1800  # 30 minutes cache
-    
-    async def analyze_wallet(self, address: str, chain: str = 'ethereum', depth: int = 1) -> Optional[Dict[str, Any]]:
-        """
-        Comprehensive wallet analysis
-        
-        Args:
-            address: Wallet address to analyze
-            chain: Blockchain to analyze (ethereum, binance, polygon)
-            depth: Analysis depth (1=basic, 2=detailed, 3=deep)
-        
-        Returns:
-            Comprehensive analysis results or None if failed
-        """
-        try:
-            logger.info(f"🔍 Analyzing wallet {address[:10]}... on {chain} (depth={depth})")
-            
-            # Check cache first
-            cache_key = f"{address}_{chain}_{depth}"
-            if cache_key in self.cache:
-                cached_data, timestamp = self.cache[cache_key]
-                if datetime.utcnow() - timestamp < timedelta(seconds=self.cache_ttl):
-                    logger.info("📋 Returning cached analysis")
-                    return cached_data
-            
-            # Simulate analysis delay based on depth
-            await asyncio.sleep(depth * 0.5)
-            
-            # Generate realistic analysis data
-            analysis = await self._generate_analysis(address, chain, depth)
-            
-            # Cache results
-            self.cache[cache_key] = (analysis, datetime.utcnow())
-            
-            logger.info(f"✅ Analysis complete for {address[:10]}...")
-            return analysis
-            
-        except Exception as e:
-            logger.error(f"Wallet analysis failed for {address}: {e}")
-            return None
-    
-    async def _generate_analysis(self, address: str, chain: str, depth: int) -> Dict[str, Any]:
-        """Generate realistic analysis data"""
-        
-        # Simulate different wallet types based on address
-        is_contract = len(address) > 42 or address.startswith('0x000')
-        
-        # Generate random but realistic metrics
-        base_score = random.uniform(30, 95)
-        win_rate = random.uniform(40, 85)
-        max_multiplier = random.uniform(5, 500)
-        total_volume = random.uniform(5000, 500000)
-        tokens_traded = random.randint(3, 50)
-        
-        # Generate top tokens
-        token_symbols = ['PEPE', 'SHIB', 'DOGE', 'BONK', 'WIF', 'MEME', 'FLOKI', 'WOJAK']
-        top_tokens = []
-        
-        for i in range(min(5, tokens_traded)):
-            symbol = random.choice(token_symbols)
-            multiplier = random.uniform(2, max_multiplier)
-            gain = random.uniform(100, 10000)
-            
-            top_tokens.append({
-                'symbol': symbol,
-                'contract': f"0x{random.randint(10**15, 10**16-1):016x}",
-                'profit_multiplier': multiplier,
-                'usd_gain': gain
-            })
-        
-        # Risk flags based on analysis
-        risk_flags = []
-        if win_rate < 50:
-            risk_flags.append('LOW_WIN_RATE')
-        if total_volume < 10000:
-            risk_flags.append('LOW_VOLUME')
-        if max_multiplier > 1000:
-            risk_flags.append('EXTREME_GAINS')
-        
-        # Classification
-        if base_score > 80:
-            classification = 'Alpha Trader'
-        elif base_score > 60:
-            classification = 'Good Trader'
-        elif base_score > 40:
-            classification = 'Average'
-        else:
-            classification = 'Risky'
-        
-        analysis = {
-            'wallet_data': {
-                'is_contract': is_contract,
-                'balance_usd': random.uniform(1000, 50000),
-                'token_count': random.randint(5, 30)
-            },
-            'win_rate': win_rate,
-            'max_multiplier': max_multiplier,
-            'total_volume_usd': total_volume,
-            'tokens_traded': tokens_traded,
-            'top_tokens': top_tokens,
-            'risk_flags': risk_flags,
-            'last_activity': datetime.now().isoformat(),
-            'classification': classification,
-            'graph_metrics': {
-                'centrality': random.uniform(0.01, 0.2),
-                'cluster_size': random.randint(5, 100),
-                'is_dev_involved': random.choice([True, False]),
-                'top_connections': [
-                    {
-                        'address': f"0x{random.randint(10**15, 10**16-1):016x}",
-                        'volume_usd': random.uniform(1000, 50000),
-                        'is_cex': random.choice([True, False])
-                    }
-                    for _ in range(random.randint(3, 8))
-                ]
-            },
-            'analysis_timestamp': datetime.now().isoformat(),
-            'score': base_score,
-            'avg_hold_time': random.uniform(1, 30)
-        }
-        
-        return analysis
-
-# Global wallet analyzer instance
-wallet_analyzer = WalletAnalyzer()
@@ -4,17 +4,20 @@ Wallet Scanner Service for Meme Trader V4 Pro
 
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+from bisect import bisect_right
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
-import json
+from dataclasses import dataclass
+import orjson
 import random
 
-from db import get_db_session, WalletWatch, ExecutorWallet
+from db import get_db_manager
 from utils.api_client import covalent_client
 from integrations.helius import helius_client
 from integrations.jupiter import jupiter_client
 from config import Config
+from utils.cache import TTLCache
 
 # Create a simple wallet analyzer for now
 class WalletAnalyzer:
@@ -42,6 +45,96 @@ wallet_analyzer = WalletAnalyzer()
 
 logger = logging.getLogger(__name__)
 
+# Wallet analyses in flight at once during a scan; upstream clients do their own rate limiting
+ANALYSIS_CONCURRENCY = 8
+
+# Comprehensive score tiers: (thresholds, points), where points[i] is awarded
+# once a value reaches thresholds[i - 1] and points[0] below the first threshold
+WIN_RATE_TIERS = ((65, 70, 80), (0, 10, 15, 20))
+MAX_MULTIPLIER_TIERS = ((50, 75, 100), (0, 10, 15, 20))
+AVG_ROI_TIERS = ((3, 5), (0, 10, 15))
+VOLUME_TIERS = ((15000, 50000, 100000), (0, 5, 10, 15))
+CONSISTENCY_TIERS = ((15, 30), (0, 5, 10))
+
+
+def _tier_points(value: float, tiers: Tuple[Tuple[float, ...], Tuple[int, ...]]) -> int:
+    """Points for the highest tier threshold that value reaches"""
+    thresholds, points = tiers
+    return points[bisect_right(thresholds, value)]
+
+
+# Demo traders served when a real scan fails; timestamps are filled in per call
+_FALLBACK_TRADERS = (
+    {
+        'wallet_address': '0x8ba1f109551bD432803012645Hac136c22C501e3',
+        'score': 89.5,
+        'win_rate': 78.5,
+        'max_multiplier': 420.0,
+        'best_multiplier': 420.0,
+        'total_profit_usd': 2850000.0,
+        'total_volume_usd': 450000.0,
+        'tokens_traded': 23,
+        'best_token_symbol': 'SHIB',
+        'best_token_contract': '0x95aD61b0a150d79219dCF64E1E6Cc01f0B64C4cE',
+        'avg_hold_time': 12.5,
+        'classification': 'Safe',
+        'graph_metrics': {'centrality': 0.15, 'cluster_size': 45}
+    },
+    {
+        'wallet_address': '0x742d35Cc6aD5C87B7c2d3fa7f5C95Ab3cde74d6b',
+        'score': 85.2,
+        'win_rate': 72.3,
+        'max_multiplier': 280.0,
+        'best_multiplier': 280.0,
+        'total_profit_usd': 1650000.0,
+        'total_volume_usd': 320000.0,
+        'tokens_traded': 19,
+        'best_token_symbol': 'PEPE',
+        'best_token_contract': '0x6982508145454Ce325dDbE47a25d4ec3d2311933',
+        'avg_hold_time': 8.7,
+        'classification': 'Safe',
+        'graph_metrics': {'centrality': 0.12, 'cluster_size': 38}
+    },
+    {
+        'wallet_address': '0xA0b86a4c3C6D3a6e1D8A6eC0b5E2C8a7d3C1E7B6',
+        'score': 82.1,
+        'win_rate': 69.8,
+        'max_multiplier': 190.0,
+        'best_multiplier': 190.0,
+        'total_profit_usd': 890000.0,
+        'total_volume_usd': 280000.0,
+        'tokens_traded': 16,
+        'best_token_symbol': 'DOGE',
+        'best_token_contract': '0xba2ae424d960c26247dd6c32edc70b295c744C43',
+        'avg_hold_time': 15.2,
+        'classification': 'Safe',
+        'graph_metrics': {'centrality': 0.09, 'cluster_size': 29}
+    }
+)
+
+# Covalent chain IDs by lowercase chain name
+CHAIN_IDS = {
+    'ethereum': 1,
+    'bsc': 56,
+    'polygon': 137,
+    'avalanche': 43114,
+    'fantom': 250,
+    'arbitrum': 42161,
+    'optimism': 10
+}
+
+@dataclass(slots=True)
+class TraderPerformance:
+    """Per-wallet performance metrics over a scan timeframe"""
+    total_trades: int
+    win_rate: float
+    max_multiplier: float
+    total_volume_usd: float
+    total_profit_usd: float
+    last_activity: str
+    top_tokens: List[Dict]
+    risk_score: float
+
 class TopTraderScanner:
     """Scans and identifies top performing traders based on multiple criteria"""
 
@@ -61,8 +154,9 @@ class TopTraderScanner:
         ]
 
         # Cache for performance
-        self.cache = {}
         self.cache_ttl = 3600  # 1 hour cache
+        self.cache = TTLCache(ttl=self.cache_ttl, maxsize=128)
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def scan_top_traders(self, timeframe: str = '7d', chain: str = 'ethereum') -> List[Dict]:
         """
@@ -133,61 +227,68 @@ class TopTraderScanner:
         4. Graph Analysis: Not flagged as dev/insider wallet
         5. Profit Verification: Actual realized profits, not paper gains
         """
+        # Check cache first
+        cache_key = f"top_traders_{limit}"
+        cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            logger.info("📋 Returning cached top traders data")
+            return cached_data
+
+        # Concurrent callers for the same limit share one scan instead of each running their own
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = self._inflight[cache_key] = asyncio.get_running_loop().create_future()
+        traders: List[Dict[str, Any]] = []
         try:
-            logger.info(f"🔍 Starting comprehensive top traders scan (limit={limit})")
+            traders = await self._run_top_traders_scan(limit, cache_key)
+            return traders
+        finally:
+            self._inflight.pop(cache_key, None)
+            future.set_result(traders)
 
-            # Check cache first
-            cache_key = f"top_traders_{limit}"
-            if cache_key in self.cache:
-                cached_data, timestamp = self.cache[cache_key]
-                if datetime.utcnow() - timestamp < timedelta(seconds=self.cache_ttl):
-                    logger.info("📋 Returning cached top traders data")
-                    return cached_data
+    async def _run_top_traders_scan(self, limit: int, cache_key: str) -> List[Dict[str, Any]]:
+        """Run the fallback top traders scan and cache its results"""
+        try:
+            logger.info(f"🔍 Starting comprehensive top traders scan (limit={limit})")
 
             top_traders = []
 
             # Step 1: Analyze seed wallets
             logger.info("📊 Analyzing seed wallets...")
-            for wallet_address in self.seed_wallets:
-                try:
-                    trader_data = await self._analyze_trader_performance_fallback(wallet_address)
-                    if trader_data and self._meets_criteria_fallback(trader_data):
-                        top_traders.append(trader_data)
-                        logger.info(f"✅ Qualified trader: {wallet_address[:10]}... (score: {trader_data['score']})")
-
-                    # Rate limiting
-                    await asyncio.sleep(0.5)
-
-                except Exception as e:
-                    logger.error(f"Failed to analyze {wallet_address}: {e}")
-                    continue
+            seed_results = await self._analyze_concurrently(
+                self.seed_wallets, self._analyze_trader_performance_fallback
+            )
+            for wallet_address, trader_data in zip(self.seed_wallets, seed_results):
+                if trader_data and self._meets_criteria_fallback(trader_data):
+                    top_traders.append(trader_data)
+                    logger.info(f"✅ Qualified trader: {wallet_address[:10]}... (score: {trader_data['score']})")
 
             # Step 2: Discover new wallets through graph analysis
             logger.info("🕸️ Discovering new wallets through graph analysis...")
-            discovered_wallets = await self._discover_connected_traders(top_traders[:5])
+            # Seed wallets were all analyzed above, qualified or not; don't analyze them twice
+            discovered_wallets = await self._discover_connected_traders(
+                top_traders[:5], exclude=set(self.seed_wallets)
+            )
 
-            for wallet_address in discovered_wallets:
+            discovered_results = await self._analyze_concurrently(
+                discovered_wallets, self._analyze_trader_performance_fallback
+            )
+            for wallet_address, trader_data in zip(discovered_wallets, discovered_results):
                 if len(top_traders) >= limit:
                     break
 
-                try:
-                    trader_data = await self._analyze_trader_performance_fallback(wallet_address)
-                    if trader_data and self._meets_criteria_fallback(trader_data):
-                        top_traders.append(trader_data)
-                        logger.info(f"✅ Discovered trader: {wallet_address[:10]}... (score: {trader_data['score']})")
-
-                    await asyncio.sleep(0.3)
-
-                except Exception as e:
-                    logger.error(f"Failed to analyze discovered wallet {wallet_address}: {e}")
-                    continue
+                if trader_data and self._meets_criteria_fallback(trader_data):
+                    top_traders.append(trader_data)
+                    logger.info(f"✅ Discovered trader: {wallet_address[:10]}... (score: {trader_data['score']})")
 
             # Step 3: Sort by comprehensive score
             top_traders.sort(key=lambda x: x['score'], reverse=True)
             final_traders = top_traders[:limit]
 
             # Cache results
-            self.cache[cache_key] = (final_traders, datetime.utcnow())
+            self.cache.set(cache_key, final_traders)
 
             logger.info(f"✅ Top traders scan complete: {len(final_traders)} qualified traders found")
             return final_traders
@@ -220,12 +321,16 @@ class TopTraderScanner:
             # Calculate comprehensive trader score
             score = self._calculate_trader_score_fallback(analysis)
 
-            # Get best performing token
+            # Best performing token and total profit in one pass
             best_token = None
             best_multiplier = 1.0
-            if top_tokens:
-                best_token = max(top_tokens, key=lambda x: x.get('profit_multiplier', 1))
-                best_multiplier = best_token.get('profit_multiplier', 1)
+            total_profit = 0
+            for token in top_tokens:
+                multiplier = token.get('profit_multiplier', 1)
+                total_profit += token.get('usd_gain', 0)
+                if best_token is None or multiplier > best_multiplier:
+                    best_token = token
+                    best_multiplier = multiplier
 
             return {
                 'wallet_address': wallet_address,
@@ -233,7 +338,7 @@ class TopTraderScanner:
                 'win_rate': win_rate,
                 'max_multiplier': max_multiplier,
                 'best_multiplier': best_multiplier,
-                'total_profit_usd': sum(token.get('usd_gain', 0) for token in top_tokens),
+                'total_profit_usd': total_profit,
                 'total_volume_usd': total_volume,
                 'tokens_traded': tokens_traded,
                 'best_token_symbol': best_token.get('symbol', 'Unknown') if best_token else 'None',
@@ -265,54 +370,23 @@ class TopTraderScanner:
         - Risk Flags (10 pts): No red flags = 10, 1-2 mild risks = 5
 
         Only wallets with ≥70 score are returned
-        """</old_str>
+        """
         score = 0.0
 
         # Win Rate scoring (20 points max) - NEW CRITERIA
-        win_rate = analysis.get('win_rate', 0)
-        if win_rate >= 80:
-            score += 20
-        elif win_rate >= 70:
-            score += 15
-        elif win_rate >= 65:
-            score += 10
-        # Below 65% gets 0 points (filter requirement)
+        score += _tier_points(analysis.get('win_rate', 0), WIN_RATE_TIERS)
 
         # Max Multiplier scoring (20 points max) - NEW CRITERIA
-        max_multiplier = analysis.get('max_multiplier', 1)
-        if max_multiplier >= 100:
-            score += 20
-        elif max_multiplier >= 75:
-            score += 15
-        elif max_multiplier >= 50:
-            score += 10
-        # Below 50x gets 0 points (filter requirement)
+        score += _tier_points(analysis.get('max_multiplier', 1), MAX_MULTIPLIER_TIERS)
 
         # Average ROI scoring (15 points max) - NEW CRITERIA
-        avg_roi = analysis.get('avg_roi', 1.0)
-        if avg_roi >= 5:
-            score += 15
-        elif avg_roi >= 3:
-            score += 10
-        # Below 3x gets 0 points (filter requirement)
+        score += _tier_points(analysis.get('avg_roi', 1.0), AVG_ROI_TIERS)
 
         # Trading Volume scoring (15 points max) - NEW CRITERIA
-        volume = analysis.get('total_volume_usd', 0)
-        if volume >= 100000:
-            score += 15
-        elif volume >= 50000:
-            score += 10
-        elif volume >= 15000:
-            score += 5
-        # Below $15k gets 0 points (filter requirement)
+        score += _tier_points(analysis.get('total_volume_usd', 0), VOLUME_TIERS)
 
         # Consistency scoring (10 points max) - NEW CRITERIA
-        tokens_traded = analysis.get('tokens_traded', 0)
-        if tokens_traded >= 30:
-            score += 10
-        elif tokens_traded >= 15:
-            score += 5
-        # Below 15 trades gets 0 points (filter requirement)
+        score += _tier_points(analysis.get('tokens_traded', 0), CONSISTENCY_TIERS)
 
         # Recency scoring (10 points max) - NEW CRITERIA
         trades_last_30_days = analysis.get('trades_last_30_days', 0)
@@ -354,49 +428,48 @@ class TopTraderScanner:
 
     def _meets_comprehensive_criteria(self, trader_data: Dict) -> bool:
         """Check if trader meets comprehensive criteria for top trader status"""
-        # Performance filters (must meet ALL)
-        performance_check = (
-            trader_data.get('win_rate', 0) >= 65 and  # >65% win rate
-            trader_data.get('max_multiplier', 0) >= 50 and  # ≥50x multiplier
-            trader_data.get('avg_roi', 0) >= 3 and  # >3x average ROI
-            trader_data.get('total_volume_usd', 0) >= 15000 and  # >$15k volume
-            trader_data.get('tokens_traded', 0) >= 15  # >15 trades
-        )
-        
-        # Activity filters
-        activity_check = (
-            trader_data.get('trades_last_30_days', 0) >= 3 and  # ≥3 trades in 30 days
-            trader_data.get('recent_roi_positive', False)  # Positive recent ROI
-        )
-        
-        # Safety filters
-        safety_check = (
-            not trader_data.get('is_blacklisted', False) and
-            not trader_data.get('is_dev_wallet', False) and
-            trader_data.get('honeypot_interactions', 0) <= 1 and  # Max 1 honeypot interaction
-            not trader_data.get('is_copycat', False)
+        get = trader_data.get
+        # One short-circuiting chain, most selective checks first: most candidates
+        # fall below the score floor and never reach the remaining filters
+        return (
+            # Minimum score requirement
+            get('score', 0) >= 70 and
+
+            # Safety filters
+            not get('is_dev_wallet', False) and
+            not get('is_blacklisted', False) and
+            get('honeypot_interactions', 0) <= 1 and  # Max 1 honeypot interaction
+            not get('is_copycat', False) and
+
+            # Performance filters (must meet ALL)
+            get('win_rate', 0) >= 65 and  # >65% win rate
+            get('max_multiplier', 0) >= 50 and  # ≥50x multiplier
+            get('avg_roi', 0) >= 3 and  # >3x average ROI
+            get('total_volume_usd', 0) >= 15000 and  # >$15k volume
+            get('tokens_traded', 0) >= 15 and  # >15 trades
+
+            # Activity filters
+            get('trades_last_30_days', 0) >= 3 and  # ≥3 trades in 30 days
+            bool(get('recent_roi_positive', False))  # Positive recent ROI
         )
-        
-        # Minimum score requirement
-        score_check = trader_data.get('score', 0) >= 70
-        
-        return performance_check and activity_check and safety_check and score_check
 
-    async def _discover_connected_traders(self, seed_traders: List[Dict]) -> List[str]:
-        """Discover new traders through graph analysis of top performers"""
+    async def _discover_connected_traders(self, seed_traders: List[Dict],
+                                          exclude: Optional[Set[str]] = None) -> List[str]:
+        """Discover new traders through graph analysis of top performers, skipping excluded addresses"""
         discovered = set()
 
         try:
-            for trader in seed_traders[:3]:  # Analyze top 3 traders
-                wallet_address = trader['wallet_address']
-
-                # Get graph analysis for this trader
-                analysis = await wallet_analyzer.analyze_wallet(
-                    address=wallet_address,
-                    chain='ethereum',
-                    depth=1  # Shallow scan for discovery
-                )
+            # Graph analysis for the top 3 traders, shallow scan for discovery
+            seed_addresses = [trader['wallet_address'] for trader in seed_traders[:3]]
+            known_addresses = {trader['wallet_address'] for trader in seed_traders}
+            if exclude:
+                known_addresses |= exclude
+            analyses = await self._analyze_concurrently(
+                seed_addresses,
+                lambda address: wallet_analyzer.analyze_wallet(address=address, chain='ethereum', depth=1)
+            )
 
+            for analysis in analyses:
                 if analysis and 'graph_metrics' in analysis:
                     connections = analysis['graph_metrics'].get('top_connections', [])
 
@@ -409,11 +482,9 @@ class TopTraderScanner:
                         if (connected_address and 
                             not is_cex and 
                             volume > 5000 and
-                            connected_address not in [t['wallet_address'] for t in seed_traders]):
+                            connected_address not in known_addresses):
                             discovered.add(connected_address)
 
-                await asyncio.sleep(0.2)  # Rate limiting
-
         except Exception as e:
             logger.error(f"Discovery scan failed: {e}")
 
@@ -423,68 +494,54 @@ class TopTraderScanner:
         """Fallback method with enhanced demo data when real scanning fails"""
         logger.info("Using fallback traders with enhanced demo data")
 
-        fallback_traders = [
-            {
-                'wallet_address': '0x8ba1f109551bD432803012645Hac136c22C501e3',
-                'score': 89.5,
-                'win_rate': 78.5,
-                'max_multiplier': 420.0,
-                'best_multiplier': 420.0,
-                'total_profit_usd': 2850000.0,
-                'total_volume_usd': 450000.0,
-                'tokens_traded': 23,
-                'best_token_symbol': 'SHIB',
-                'best_token_contract': '0x95aD61b0a150d79219dCF64E1E6Cc01f0B64C4cE',
-                'avg_hold_time': 12.5,
-                'risk_flags': [],
-                'last_activity': datetime.now().isoformat(),
-                'discovery_date': datetime.now().strftime('%Y-%m-%d'),
-                'classification': 'Safe',
-                'graph_metrics': {'centrality': 0.15, 'cluster_size': 45},
-                'analysis_timestamp': datetime.now().isoformat()
-            },
-            {
-                'wallet_address': '0x742d35Cc6aD5C87B7c2d3fa7f5C95Ab3cde74d6b',
-                'score': 85.2,
-                'win_rate': 72.3,
-                'max_multiplier': 280.0,
-                'best_multiplier': 280.0,
-                'total_profit_usd': 1650000.0,
-                'total_volume_usd': 320000.0,
-                'tokens_traded': 19,
-                'best_token_symbol': 'PEPE',
-                'best_token_contract': '0x6982508145454Ce325dDbE47a25d4ec3d2311933',
-                'avg_hold_time': 8.7,
-                'risk_flags': [],
-                'last_activity': datetime.now().isoformat(),
-                'discovery_date': datetime.now().strftime('%Y-%m-%d'),
-                'classification': 'Safe',
-                'graph_metrics': {'centrality': 0.12, 'cluster_size': 38},
-                'analysis_timestamp': datetime.now().isoformat()
-            },
+        now = datetime.now()
+        last_activity = now.isoformat()
+        discovery_date = now.strftime('%Y-%m-%d')
+
+        return [
             {
-                'wallet_address': '0xA0b86a4c3C6D3a6e1D8A6eC0b5E2C8a7d3C1E7B6',
-                'score': 82.1,
-                'win_rate': 69.8,
-                'max_multiplier': 190.0,
-                'best_multiplier': 190.0,
-                'total_profit_usd': 890000.0,
-                'total_volume_usd': 280000.0,
-                'tokens_traded': 16,
-                'best_token_symbol': 'DOGE',
-                'best_token_contract': '0xba2ae424d960c26247dd6c32edc70b295c744C43',
-                'avg_hold_time': 15.2,
+                **trader,
                 'risk_flags': [],
-                'last_activity': datetime.now().isoformat(),
-                'discovery_date': datetime.now().strftime('%Y-%m-%d'),
-                'classification': 'Safe',
-                'graph_metrics': {'centrality': 0.09, 'cluster_size': 29},
-                'analysis_timestamp': datetime.now().isoformat()
+                'last_activity': last_activity,
+                'discovery_date': discovery_date,
+                'graph_metrics': dict(trader['graph_metrics']),
+                'analysis_timestamp': last_activity
             }
+            for trader in _FALLBACK_TRADERS[:limit]
         ]
 
-        return fallback_traders[:limit]
 
+    async def _analyze_concurrently(self, addresses: List[str],
+                                    analyze: Callable[[str], Awaitable[Any]]) -> List[Any]:
+        """Run analyze for each address on a bounded worker pool; failures come back as None"""
+        analyses: List[Any] = [None] * len(addresses)
+        if not addresses:
+            return analyses
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=ANALYSIS_CONCURRENCY * 2)
+
+        async def worker():
+            while True:
+                index, address = await queue.get()
+                try:
+                    analyses[index] = await analyze(address)
+                except Exception as e:
+                    logger.error(f"Failed to analyze {address}: {e}")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker())
+                   for _ in range(min(ANALYSIS_CONCURRENCY, len(addresses)))]
+        try:
+            for item in enumerate(addresses):
+                await queue.put(item)
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        return analyses
 
     def _parse_timeframe(self, timeframe: str) -> int:
         """Convert timeframe string to days"""
@@ -498,48 +555,18 @@ class TopTraderScanner:
             return 7  # Default to 7 days
 
     async def _store_scanner_results(self, traders: List[Dict], timeframe: str, chain: str):
-        """Store scanner results in the database"""
+        """Store scanner results in the wallets table"""
         try:
-            session = await get_db_session()
+            db_manager = get_db_manager()
             for trader in traders:
-                # Check if wallet already exists for this chain and timeframe
-                existing_wallet = session.query(WalletWatch).filter(
-                    WalletWatch.wallet_address == trader['address'],
-                    WalletWatch.chain == chain,
-                    WalletWatch.timeframe == timeframe
-                ).first()
-
-                if existing_wallet:
-                    # Update existing record
-                    for key, value in trader.items():
-                        setattr(existing_wallet, key, value)
-                    existing_wallet.last_scanned = datetime.utcnow()
-                else:
-                    # Create new record
-                    new_wallet = WalletWatch(
-                        wallet_address=trader['address'],
-                        chain=chain,
-                        timeframe=timeframe,
-                        profit_multiplier=trader.get('profit_multiplier'),
-                        total_profit_usd=trader.get('total_profit_usd'),
-                        win_rate=trader.get('win_rate'),
-                        total_volume_usd=trader.get('total_volume_usd'),
-                        trade_count=trader.get('trade_count'),
-                        last_activity=datetime.fromisoformat(trader['last_activity']) if trader.get('last_activity') else None,
-                        top_tokens=json.dumps(trader.get('top_tokens', [])),
-                        risk_score=trader.get('risk_score'),
-                        classification=trader.get('classification'),
-                        last_scanned=datetime.utcnow()
-                    )
-                    session.add(new_wallet)
-            await session.commit()
+                db_manager.update_wallet_metrics(trader['wallet_address'], chain, {
+                    'score': trader.get('score', 0),
+                    'win_rate': trader.get('win_rate', 0),
+                    'max_mult': trader.get('max_multiplier', 1)
+                })
             logger.info(f"Stored {len(traders)} results for {chain} ({timeframe})")
         except Exception as e:
             logger.error(f"Failed to store scanner results: {e}")
-            await session.rollback()
-        finally:
-            await session.close()
-
 
     async def _scan_solana_traders(self, days: int, min_multiplier: float, min_volume_usd: float) -> List[Dict]:
         """Scan Solana for top traders using Helius"""
@@ -547,25 +574,26 @@ class TopTraderScanner:
             # Get profitable wallets from Helius
             profitable_wallets = await helius_client.scan_profitable_wallets(days, min_multiplier)
 
-            traders = []
-            for wallet_data in profitable_wallets:
-                address = wallet_data['address']
-
-                # Get detailed analysis
-                analysis = await self._analyze_trader_performance(address, 'solana', days)
+            # Get detailed analysis
+            addresses = [wallet_data['address'] for wallet_data in profitable_wallets]
+            analyses = await self._analyze_concurrently(
+                addresses, lambda address: self._analyze_trader_performance(address, 'solana', days)
+            )
 
-                if analysis and analysis.get('total_volume_usd', 0) >= min_volume_usd:
+            traders = []
+            for wallet_data, address, analysis in zip(profitable_wallets, addresses, analyses):
+                if analysis and analysis.total_volume_usd >= min_volume_usd:
                     trader_info = {
                         'address': address,
                         'chain': 'solana',
                         'profit_multiplier': wallet_data['max_multiplier'],
                         'total_profit_usd': wallet_data['total_profit'],
-                        'win_rate': analysis.get('win_rate', 0),
-                        'total_volume_usd': analysis['total_volume_usd'],
+                        'win_rate': analysis.win_rate,
+                        'total_volume_usd': analysis.total_volume_usd,
                         'trade_count': wallet_data.get('trade_count', 0),
                         'last_activity': wallet_data.get('last_activity', datetime.utcnow().isoformat()),
-                        'top_tokens': analysis.get('top_tokens', []),
-                        'risk_score': analysis.get('risk_score', 50),
+                        'top_tokens': analysis.top_tokens,
+                        'risk_score': analysis.risk_score,
                         'classification': self._classify_trader(analysis)
                     }
                     traders.append(trader_info)
@@ -625,35 +653,30 @@ class TopTraderScanner:
             traders = []
 
             # Analyze each wallet
-            for address in list(wallet_addresses)[:50]:  # Limit to 50 wallets for performance
-                try:
-                    analysis = await self._analyze_trader_performance(address, chain, days)
-
-                    if (analysis and 
-                        analysis.get('max_multiplier', 1) >= min_multiplier and
-                        analysis.get('total_volume_usd', 0) >= min_volume_usd):
-
-                        trader_info = {
-                            'address': address,
-                            'chain': chain,
-                            'profit_multiplier': analysis['max_multiplier'],
-                            'total_profit_usd': analysis.get('total_profit_usd', 0),
-                            'win_rate': analysis.get('win_rate', 0),
-                            'total_volume_usd': analysis['total_volume_usd'],
-                            'trade_count': analysis.get('total_trades', 0),
-                            'last_activity': analysis.get('last_activity', datetime.utcnow().isoformat()),
-                            'top_tokens': analysis.get('top_tokens', []),
-                            'risk_score': analysis.get('risk_score', 50),
-                            'classification': self._classify_trader(analysis)
-                        }
-                        traders.append(trader_info)
+            addresses = list(wallet_addresses)[:50]  # Limit to 50 wallets for performance
+            analyses = await self._analyze_concurrently(
+                addresses, lambda address: self._analyze_trader_performance(address, chain, days)
+            )
 
-                except Exception as e:
-                    logger.error(f"Failed to analyze wallet {address}: {e}")
-                    continue
+            for address, analysis in zip(addresses, analyses):
+                if (analysis and 
+                    analysis.max_multiplier >= min_multiplier and
+                    analysis.total_volume_usd >= min_volume_usd):
 
-                # Rate limiting
-                await asyncio.sleep(0.1)
+                    trader_info = {
+                        'address': address,
+                        'chain': chain,
+                        'profit_multiplier': analysis.max_multiplier,
+                        'total_profit_usd': analysis.total_profit_usd,
+                        'win_rate': analysis.win_rate,
+                        'total_volume_usd': analysis.total_volume_usd,
+                        'trade_count': analysis.total_trades,
+                        'last_activity': analysis.last_activity,
+                        'top_tokens': analysis.top_tokens,
+                        'risk_score': analysis.risk_score,
+                        'classification': self._classify_trader(analysis)
+                    }
+                    traders.append(trader_info)
 
             return sorted(traders, key=lambda x: x['profit_multiplier'], reverse=True)[:20]
 
@@ -689,7 +712,7 @@ class TopTraderScanner:
             logger.error(f"Failed to get high volume swaps: {e}")
             return []
 
-    async def _analyze_trader_performance(self, address: str, chain: str, days: int) -> Optional[Dict]:
+    async def _analyze_trader_performance(self, address: str, chain: str, days: int) -> Optional[TraderPerformance]:
         """Analyze trader performance over specified timeframe"""
         try:
             if chain.lower() == 'solana':
@@ -709,7 +732,7 @@ class TopTraderScanner:
             logger.error(f"Performance analysis failed for {address}: {e}")
             return None
 
-    async def _calculate_solana_performance(self, transactions: List[Dict], days: int) -> Dict:
+    async def _calculate_solana_performance(self, transactions: List[Dict], days: int) -> Optional[TraderPerformance]:
         """Calculate performance metrics for Solana wallet"""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
@@ -769,22 +792,22 @@ class TopTraderScanner:
 
             win_rate = (profitable_trades / trade_count * 100) if trade_count > 0 else 0
 
-            return {
-                'total_trades': trade_count,
-                'win_rate': win_rate,
-                'max_multiplier': max_multiplier,
-                'total_volume_usd': total_volume,
-                'total_profit_usd': total_profit,
-                'last_activity': datetime.utcnow().isoformat(),
-                'top_tokens': sorted(top_tokens, key=lambda x: x['multiplier'], reverse=True)[:5],
-                'risk_score': 100 - min(100, win_rate + (max_multiplier / 10))
-            }
+            return TraderPerformance(
+                total_trades=trade_count,
+                win_rate=win_rate,
+                max_multiplier=max_multiplier,
+                total_volume_usd=total_volume,
+                total_profit_usd=total_profit,
+                last_activity=datetime.utcnow().isoformat(),
+                top_tokens=sorted(top_tokens, key=lambda x: x['multiplier'], reverse=True)[:5],
+                risk_score=100 - min(100, win_rate + (max_multiplier / 10))
+            )
 
         except Exception as e:
             logger.error(f"Solana performance calculation failed: {e}")
-            return {}
+            return None
 
-    async def _calculate_evm_performance(self, transactions: List[Dict], days: int) -> Dict:
+    async def _calculate_evm_performance(self, transactions: List[Dict], days: int) -> Optional[TraderPerformance]:
         """Calculate performance metrics for EVM wallet"""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
@@ -831,26 +854,26 @@ class TopTraderScanner:
                  total_trades = max(total_trades, estimated_trades)
 
 
-            return {
-                'total_trades': total_trades,
-                'win_rate': win_rate,
-                'max_multiplier': max_multiplier,
-                'total_volume_usd': total_volume_usd,
-                'total_profit_usd': total_profit_usd,
-                'last_activity': datetime.utcnow().isoformat(),
-                'top_tokens': sorted(top_tokens, key=lambda x: x.get('multiplier', 0), reverse=True)[:5],
-                'risk_score': 100 - min(100, win_rate + (max_multiplier / 10))
-            }
+            return TraderPerformance(
+                total_trades=total_trades,
+                win_rate=win_rate,
+                max_multiplier=max_multiplier,
+                total_volume_usd=total_volume_usd,
+                total_profit_usd=total_profit_usd,
+                last_activity=datetime.utcnow().isoformat(),
+                top_tokens=sorted(top_tokens, key=lambda x: x.get('multiplier', 0), reverse=True)[:5],
+                risk_score=100 - min(100, win_rate + (max_multiplier / 10))
+            )
 
         except Exception as e:
             logger.error(f"EVM performance calculation failed: {e}")
-            return {}
+            return None
 
-    def _classify_trader(self, analysis: Dict) -> str:
+    def _classify_trader(self, analysis: TraderPerformance) -> str:
         """Classify trader based on analysis"""
-        win_rate = analysis.get('win_rate', 0)
-        max_multiplier = analysis.get('max_multiplier', 1)
-        volume = analysis.get('total_volume_usd', 0)
+        win_rate = analysis.win_rate
+        max_multiplier = analysis.max_multiplier
+        volume = analysis.total_volume_usd
 
         if win_rate > 80 and max_multiplier > 500 and volume > 50000:
             return 'Alpha Whale'
@@ -899,16 +922,7 @@ class TopTraderScanner:
 
     def _get_chain_id(self, chain: str) -> int:
         """Get chain ID for Covalent API"""
-        chain_map = {
-            'ethereum': 1,
-            'bsc': 56,
-            'polygon': 137,
-            'avalanche': 43114,
-            'fantom': 250,
-            'arbitrum': 42161,
-            'optimism': 10
-        }
-        return chain_map.get(chain.lower(), 1) # Default to Ethereum
+        return CHAIN_IDS.get(chain.lower(), 1) # Default to Ethereum
 
 
 class WalletScanner:
@@ -934,7 +948,7 @@ class WalletScanner:
             # If not enough moonshots, include high performers (100x+)
             if len(moonshots) < 5:
                 high_performers = [
-                    trader for trader in top_trader_scanner.cache.get("top_traders_15", ([], None))[0] # Access cached data if available
+                    trader for trader in self.top_trader_scanner.cache.get("top_traders_15", []) # Access cached data if available
                     if trader.get('best_multiplier', 0) >= 100.0 and trader not in moonshots
                 ]
                 moonshots.extend(high_performers[:5])
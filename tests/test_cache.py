@@ -0,0 +1,128 @@
+import sqlite3
+
+import pytest
+
+from utils.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test suite for the TTL cache"""
+
+    @pytest.fixture
+    def persist_path(self, tmp_path):
+        """Path for an on-disk cache"""
+        return str(tmp_path / "cache.sqlite")
+
+    def test_get_returns_stored_value(self):
+        """Test a stored value is returned until it expires"""
+        cache = TTLCache(ttl=60)
+        cache.set("key", {"price": 1.5})
+
+        assert cache.get("key") == {"price": 1.5}
+        assert cache.get("missing", "default") == "default"
+
+    def test_expired_entry_is_dropped(self):
+        """Test an expired entry returns the default and is evicted"""
+        cache = TTLCache(ttl=60)
+        cache.set("key", "value", ttl=0)
+
+        assert cache.get("key", "default") == "default"
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_overrides_default(self):
+        """Test set() ttl applies to that entry only"""
+        cache = TTLCache(ttl=0)
+        cache.set("short", 1)
+        cache.set("long", 2, ttl=60)
+
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_set_many_stores_every_item(self):
+        """Test set_many stores each item with the shared ttl"""
+        cache = TTLCache(ttl=0)
+        cache.set_many([("a", 1), ("b", 2)], ttl=60)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") == 2
+
+    def test_disk_round_trip(self, persist_path):
+        """Test persisted entries survive a new cache instance"""
+        cache = TTLCache(ttl=60, persist_path=persist_path)
+        cache.set(("cg_price", "0xabc", "usd"), 1.25)
+        cache.set_many([("a", [1, 2]), ("b", {"x": 1})])
+
+        reopened = TTLCache(ttl=60, persist_path=persist_path)
+        assert reopened.get(("cg_price", "0xabc", "usd")) == 1.25
+        assert reopened.get("a") == [1, 2]
+        assert reopened.get("b") == {"x": 1}
+
+    def test_set_many_commits_once(self, persist_path):
+        """Test set_many writes a batch in a single commit"""
+        cache = TTLCache(ttl=60, persist_path=persist_path)
+        commits = []
+        disk = cache._disk
+
+        class CountingConnection:
+            def __getattr__(self, name):
+                return getattr(disk, name)
+
+            def commit(self):
+                commits.append(1)
+                disk.commit()
+
+        cache._disk = CountingConnection()
+        cache.set_many((str(i), i) for i in range(250))
+
+        assert len(commits) == 1
+        rows = sqlite3.connect(persist_path).execute("SELECT COUNT(*) FROM cache").fetchone()
+        assert rows[0] == 250
+
+    def test_expired_disk_entries_are_not_loaded(self, persist_path):
+        """Test expired rows on disk are ignored and purged on open"""
+        cache = TTLCache(ttl=60, persist_path=persist_path)
+        cache.set("stale", 1, ttl=0)
+        cache.set("fresh", 2)
+
+        reopened = TTLCache(ttl=60, persist_path=persist_path)
+        assert reopened.get("stale") is None
+        assert reopened.get("fresh") == 2
+        rows = sqlite3.connect(persist_path).execute("SELECT key FROM cache").fetchall()
+        assert rows == [("fresh",)]
+
+    def test_delete_and_clear_reach_disk(self, persist_path):
+        """Test delete() and clear() also remove persisted rows"""
+        cache = TTLCache(ttl=60, persist_path=persist_path)
+        cache.set_many([("a", 1), ("b", 2), ("c", 3)])
+        cache.delete("a")
+
+        assert TTLCache(ttl=60, persist_path=persist_path).get("a") is None
+        assert TTLCache(ttl=60, persist_path=persist_path).get("b") == 2
+
+        cache.clear()
+        reopened = TTLCache(ttl=60, persist_path=persist_path)
+        assert reopened.get("b") is None
+        assert reopened.get("c") is None
+
+    def test_unwritable_path_disables_persistence(self, tmp_path):
+        """Test a bad persist_path falls back to an in-memory cache"""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        cache = TTLCache(ttl=60, persist_path=str(blocker / "cache.sqlite"))
+        cache.set("key", "value")
+
+        assert cache._disk is None
+        assert cache.get("key") == "value"
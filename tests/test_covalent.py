@@ -0,0 +1,134 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from services.covalent import CovalentClient, TokenTransfer, _address_to_int, _pair_fifo
+
+WALLET = "0x742d35Cc6aD5C87B7c2d3fa7f5C95Ab3cde74d6b"
+COUNTERPARTY = "0x8ba1f109551bD432803012645Ac136c22C501e3a"
+TOKEN = "0x6982508145454Ce325dDbE47a25d4ec3d2311933"
+
+
+def make_transfer(from_address: str, block_height: int, value_usd: float,
+                  block_signed_at: str = "2024-01-01T00:00:00Z") -> TokenTransfer:
+    """Build a transfer of TOKEN with only the fields analysis reads"""
+    return TokenTransfer(
+        tx_hash=f"0x{block_height:064x}",
+        block_height=block_height,
+        block_signed_at=block_signed_at,
+        from_address=from_address,
+        to_address=COUNTERPARTY,
+        token_address=TOKEN,
+        token_symbol="PEPE",
+        token_name="Pepe",
+        amount="1",
+        decimals=18,
+        value_usd=value_usd,
+        gas_offered=0,
+        gas_spent=0,
+        gas_price=0,
+        fees_paid=0.0,
+        gas_quote_rate=0.0
+    )
+
+
+class TestPairFifo:
+    """Test suite for FIFO trade pairing"""
+
+    def test_pairs_in_fifo_order(self):
+        """Test each sell closes the earliest open buy"""
+        result = _pair_fifo(
+            [1, 2], [100.0, 200.0],
+            [3, 4], [300.0, 100.0],
+            [10.0, 20.0], 0.0
+        )
+        trade_count, win_count, max_multiplier, roi_sum, volume, recent = result
+
+        assert trade_count == 2
+        assert win_count == 1
+        assert max_multiplier == pytest.approx(3.0)
+        assert roi_sum == pytest.approx(3.5)
+        assert volume == pytest.approx(300.0)
+        assert recent == 2
+
+    def test_sell_before_buy_is_skipped(self):
+        """Test a sell mined before the open buy is not paired with it"""
+        result = _pair_fifo([5], [100.0], [3, 6], [50.0, 200.0], [1.0, 2.0], 0.0)
+
+        assert result[0] == 1
+        assert result[2] == pytest.approx(2.0)
+
+    def test_same_block_is_not_paired(self):
+        """Test a buy and sell in the same block don't form a trade"""
+        assert _pair_fifo([5], [100.0], [5], [200.0], [1.0], 0.0)[0] == 0
+
+    def test_zero_value_buy_is_consumed_but_not_counted(self):
+        """Test buys without a USD value use up a sell without counting"""
+        result = _pair_fifo([1, 2], [0.0, 100.0], [3, 4], [500.0, 150.0], [1.0, 1.0], 0.0)
+
+        assert result[0] == 1
+        assert result[2] == pytest.approx(1.5)
+        assert result[4] == pytest.approx(100.0)
+
+    def test_recent_count_uses_cutoff(self):
+        """Test only sells after the cutoff count as recent"""
+        result = _pair_fifo([1, 2], [100.0, 100.0], [3, 4], [50.0, 50.0], [5.0, 15.0], 10.0)
+
+        assert result[1] == 0
+        assert result[5] == 1
+
+    def test_no_buys(self):
+        """Test pairing with no buys yields empty aggregates"""
+        assert _pair_fifo([], [], [1], [10.0], [1.0], 0.0) == (0, 0, 0.0, 0.0, 0.0, 0)
+
+
+class TestAddressMatching:
+    """Test suite for sender address comparison"""
+
+    def test_address_to_int_ignores_case(self):
+        """Test checksummed and lowercase addresses map to the same int"""
+        assert _address_to_int(WALLET) == _address_to_int(WALLET.lower())
+
+    @pytest.mark.parametrize("address", ["not-an-address", "", None])
+    def test_address_to_int_rejects_malformed(self, address):
+        """Test malformed addresses map to None"""
+        assert _address_to_int(address) is None
+
+    def test_malformed_sender_is_never_the_wallet(self):
+        """Test a transfer from a malformed sender counts as a buy"""
+        transfer = make_transfer("garbage", 1, 100.0)
+
+        assert transfer.from_addr_int is None
+        assert transfer.from_addr_int != _address_to_int(WALLET)
+
+    @pytest.fixture
+    def client(self):
+        """Covalent client with transfers supplied by the test"""
+        client = CovalentClient()
+        client.get_wallet_transactions = AsyncMock()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_malformed_wallet_does_not_match_malformed_senders(self, client):
+        """Test two different malformed addresses are not paired as the same wallet"""
+        client.get_wallet_transactions.return_value = [
+            make_transfer(COUNTERPARTY, 1, 100.0),
+            make_transfer("other-garbage", 2, 300.0)
+        ]
+
+        assert await client.analyze_wallet_performance("garbage", 1) is None
+
+    @pytest.mark.asyncio
+    async def test_wallet_trades_are_paired_case_insensitively(self, client):
+        """Test sells are matched to the wallet regardless of address case"""
+        client.get_wallet_transactions.return_value = [
+            make_transfer(COUNTERPARTY, 1, 100.0),
+            make_transfer(WALLET.lower(), 2, 300.0)
+        ]
+
+        metrics = await client.analyze_wallet_performance(WALLET, 1)
+
+        assert metrics is not None
+        assert metrics.trade_count == 1
+        assert metrics.max_multiplier == pytest.approx(3.0)
+        assert metrics.win_rate == pytest.approx(100.0)
@@ -0,0 +1,106 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from integrations import goplus
+from integrations.goplus import GoPlusClient
+from services.wallet_analyzer import WalletAnalyzer
+
+WALLET = "0x742d35cc6ad5c87b7c2d3fa7f5c95ab3cde74d6b"
+CONTRACTS = [f"0x{i:040X}" for i in range(1, 151)]
+
+
+def security_response(params, honeypots=()):
+    """GoPlus token_security payload for the requested contracts"""
+    return {'result': {
+        address: {'is_honeypot': '1' if address in honeypots else '0', 'buy_tax': '0', 'sell_tax': '0'}
+        for address in params['contract_addresses'].split(',')
+    }}
+
+
+class TestTokenSecurityBatch:
+    """Test suite for batched GoPlus token security lookups"""
+
+    @pytest.fixture
+    def client(self):
+        """GoPlus client with requests answered by the test"""
+        client = GoPlusClient("test-key")
+        client.make_request = AsyncMock(side_effect=lambda method, endpoint, params: security_response(params))
+        return client
+
+    @pytest.mark.asyncio
+    async def test_misses_are_fetched_in_batches(self, client):
+        """Test uncached contracts are requested SECURITY_BATCH_SIZE at a time"""
+        results = await client.check_token_security_batch(1, CONTRACTS)
+
+        assert client.make_request.await_count == 2
+        sizes = [len(call.kwargs['params']['contract_addresses'].split(','))
+                 for call in client.make_request.await_args_list]
+        assert sizes == [goplus.SECURITY_BATCH_SIZE, len(CONTRACTS) - goplus.SECURITY_BATCH_SIZE]
+        assert set(results) == {address.lower() for address in CONTRACTS}
+        assert all(result['is_honeypot'] is False for result in results.values())
+
+    @pytest.mark.asyncio
+    async def test_cached_verdicts_are_not_refetched(self, client):
+        """Test only contracts missing from the shared cache are requested"""
+        await client.check_token_security(1, CONTRACTS[0])
+        await client.check_token_security_batch(1, CONTRACTS[:3])
+
+        requested = client.make_request.await_args_list[-1].kwargs['params']['contract_addresses']
+        assert requested.split(',') == [address.lower() for address in CONTRACTS[1:3]]
+
+        await client.check_token_security_batch(1, CONTRACTS[:3])
+        assert client.make_request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_yields_none(self, client):
+        """Test contracts from a failed request come back as None"""
+        client.make_request.side_effect = None
+        client.make_request.return_value = None
+
+        results = await client.check_token_security_batch(1, CONTRACTS[:2])
+
+        assert results == {address.lower(): None for address in CONTRACTS[:2]}
+
+
+class TestWalletHoneypotInteractions:
+    """Test suite for honeypot checks of a wallet's top tokens"""
+
+    @pytest.fixture
+    def analyzer(self):
+        """Analyzer with stubbed data sources and GoPlus client"""
+        analyzer = WalletAnalyzer()
+        analyzer._get_wallet_basic_data = AsyncMock(return_value={'transaction_count': 50})
+        analyzer._analyze_trading_history = AsyncMock(return_value={
+            'win_rate': 70,
+            'top_tokens': [{'symbol': f"T{i}", 'contract': CONTRACTS[i]} for i in range(3)]
+        })
+        analyzer._analyze_wallet_graph = AsyncMock(return_value={})
+        analyzer._get_top_counterparties = AsyncMock(return_value=[])
+        analyzer.goplus_client = Mock()
+        analyzer.goplus_client.check_token_security_batch = AsyncMock(return_value={
+            CONTRACTS[0].lower(): {'is_honeypot': True},
+            CONTRACTS[1].lower(): {'is_honeypot': False},
+            CONTRACTS[2].lower(): None
+        })
+        return analyzer
+
+    @pytest.mark.asyncio
+    async def test_top_tokens_share_one_lookup(self, analyzer):
+        """Test every top token is checked in a single batched call"""
+        analysis = await analyzer.analyze_wallet(WALLET, 'ethereum', depth=1)
+
+        analyzer.goplus_client.check_token_security_batch.assert_awaited_once_with(
+            1, [address.lower() for address in CONTRACTS[:3]]
+        )
+        assert [token['is_honeypot'] for token in analysis['top_tokens']] == [True, False, False]
+        assert analysis['honeypot_interactions'] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_is_not_counted(self, analyzer):
+        """Test a GoPlus error doesn't mark the wallet's tokens as honeypots"""
+        analyzer.goplus_client.check_token_security_batch.side_effect = RuntimeError("boom")
+
+        analysis = await analyzer.analyze_wallet(WALLET, 'ethereum', depth=1)
+
+        assert analysis['honeypot_interactions'] == 0
@@ -0,0 +1,203 @@
+import asyncio
+import importlib
+import sqlite3
+import sys
+import threading
+import types
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from db import DatabaseManager, MirrorTradeData
+
+SOURCE_WALLET = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+TOKEN_MINT = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
+# Legacy solana-py modules imported by the execution engine, newer releases dropped them
+LEGACY_SOLANA_MODULES = {
+    'solana.transaction': 'Transaction',
+    'solana.keypair': 'Keypair',
+    'solana.publickey': 'PublicKey'
+}
+
+
+def make_trade(tx_hash: str = "tx1", **overrides) -> MirrorTradeData:
+    """Build a mirror trade log entry"""
+    fields = dict(
+        source_wallet=SOURCE_WALLET,
+        token_address=TOKEN_MINT,
+        action="BUY",
+        tx_hash=tx_hash,
+        amount_usd=125.0,
+        timestamp=1_700_000_000,
+        success=True,
+        error_message=None
+    )
+    fields.update(overrides)
+    return MirrorTradeData(**fields)
+
+
+@pytest.fixture
+def mirror_trading(monkeypatch):
+    """The mirror trading module, with missing legacy solana modules stubbed"""
+    for name, attr in LEGACY_SOLANA_MODULES.items():
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            module = types.ModuleType(name)
+            setattr(module, attr, Mock())
+            monkeypatch.setitem(sys.modules, name, module)
+    from services import mirror_trading
+    return mirror_trading
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Database manager backed by a temporary SQLite file"""
+    return DatabaseManager(str(tmp_path / "mirror.db"))
+
+
+class TestMirrorTradeStorage:
+    """Test suite for mirror trade persistence"""
+
+    def test_add_mirror_trades_inserts_batch(self, db_manager):
+        """Test a batch of mirror trades is stored"""
+        trades = [make_trade(f"tx{i}", timestamp=1_700_000_000 + i) for i in range(3)]
+
+        assert db_manager.add_mirror_trades(trades) is True
+
+        stored = db_manager.get_mirror_trades()
+        assert [row['tx_hash'] for row in stored] == ["tx2", "tx1", "tx0"]
+        assert stored[0]['source_wallet'] == SOURCE_WALLET
+        assert stored[0]['amount_usd'] == 125.0
+        assert stored[0]['success'] == 1
+
+    def test_failed_batch_is_rolled_back(self, db_manager):
+        """Test a batch with an invalid row leaves nothing behind"""
+        trades = [make_trade("tx0"), make_trade("tx1", source_wallet=None)]
+
+        assert db_manager.add_mirror_trades(trades) is False
+        assert db_manager.get_mirror_trades() == []
+
+
+class TestMirrorTradeWriter:
+    """Test suite for the background mirror trade writer"""
+
+    @pytest.fixture
+    def service(self, mirror_trading, db_manager, monkeypatch):
+        """Mirror trading service writing to the temporary database"""
+        monkeypatch.setattr(mirror_trading, 'get_db_manager', lambda: db_manager)
+        monkeypatch.setattr(mirror_trading, 'LOG_FLUSH_INTERVAL', 0)
+        return mirror_trading.MirrorTradingService()
+
+    def test_log_queue_is_bounded(self, service, mirror_trading):
+        """Test the writer queue has a fixed capacity"""
+        assert service._log_queue.maxsize == mirror_trading.LOG_QUEUE_MAXSIZE
+
+    @pytest.mark.asyncio
+    async def test_queued_trade_lands_in_db(self, service, db_manager):
+        """Test a logged trade is written by the background writer"""
+        await service._log_mirror_trade(TOKEN_MINT, "BUY", {'tx_hash': "tx1", 'success': True,
+                                                             'amount_usd': 50.0}, SOURCE_WALLET)
+
+        for _ in range(50):
+            if db_manager.get_mirror_trades():
+                break
+            await asyncio.sleep(0.01)
+
+        stored = db_manager.get_mirror_trades()
+        assert len(stored) == 1
+        assert stored[0]['tx_hash'] == "tx1"
+        assert stored[0]['amount_usd'] == 50.0
+        await service.stop_mirror_trading()
+
+    @pytest.mark.asyncio
+    async def test_stop_persists_pending_trades(self, service, db_manager):
+        """Test stopping mirror trading writes trades still in the queue"""
+        for i in range(5):
+            await service._log_mirror_trade(TOKEN_MINT, "SELL", {'tx_hash': f"tx{i}", 'success': False,
+                                                                  'error': "slippage"}, SOURCE_WALLET)
+
+        await service.stop_mirror_trading()
+
+        stored = db_manager.get_mirror_trades()
+        assert sorted(row['tx_hash'] for row in stored) == [f"tx{i}" for i in range(5)]
+        assert all(row['error_message'] == "slippage" for row in stored)
+        assert service._log_task is None
+
+    @pytest.mark.asyncio
+    async def test_batches_share_one_connection(self, service, mirror_trading, db_manager, monkeypatch):
+        """Test the writer reuses one connection across batches and closes it on stop"""
+        monkeypatch.setattr(mirror_trading, 'LOG_BATCH_SIZE', 2)
+        batches = []
+        add_mirror_trades = db_manager.add_mirror_trades
+
+        def record_batch(trades, conn=None):
+            batches.append((len(trades), conn))
+            return add_mirror_trades(trades, conn)
+
+        monkeypatch.setattr(db_manager, 'add_mirror_trades', record_batch)
+
+        for i in range(5):
+            await service._log_mirror_trade(TOKEN_MINT, "BUY", {'tx_hash': f"tx{i}", 'success': True},
+                                            SOURCE_WALLET)
+        for _ in range(50):
+            if len(db_manager.get_mirror_trades()) == 5:
+                break
+            await asyncio.sleep(0.01)
+
+        assert [size for size, _ in batches] == [2, 2, 1]
+        connections = {id(conn) for _, conn in batches}
+        assert len(connections) == 1
+        conn = batches[0][1]
+        assert conn is not None
+
+        await service.stop_mirror_trading()
+
+        assert len(db_manager.get_mirror_trades()) == 5
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    @pytest.mark.asyncio
+    async def test_writes_run_off_the_event_loop(self, service, db_manager, monkeypatch):
+        """Test batches are written on a worker thread, not the loop's thread"""
+        threads = []
+        add_mirror_trades = db_manager.add_mirror_trades
+
+        def record_thread(trades, conn=None):
+            threads.append(threading.current_thread())
+            return add_mirror_trades(trades, conn)
+
+        monkeypatch.setattr(db_manager, 'add_mirror_trades', record_thread)
+
+        await service._log_mirror_trade(TOKEN_MINT, "BUY", {'tx_hash': "tx1", 'success': True}, SOURCE_WALLET)
+        await service.stop_mirror_trading()
+
+        assert len(db_manager.get_mirror_trades()) == 1
+        assert threads and threading.main_thread() not in threads
+
+
+class TestWalletActivityDedup:
+    """Test suite for skipping transactions seen on an earlier poll"""
+
+    @pytest.fixture
+    def service(self, mirror_trading, monkeypatch):
+        """Mirror trading service with Helius and trade processing stubbed"""
+        service = mirror_trading.MirrorTradingService()
+        service._process_mirror_transaction = AsyncMock()
+        monkeypatch.setattr(mirror_trading.helius_client, 'monitor_wallet_activity', AsyncMock(
+            return_value=[{'signature': "sig1"}, {'signature': "sig2"}]
+        ))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_overlapping_polls_process_each_transaction_once(self, service):
+        """Test a transaction returned by two polls is only mirrored once"""
+        assert await service._check_wallet_activity(SOURCE_WALLET) is True
+        assert await service._check_wallet_activity(SOURCE_WALLET) is False
+
+        assert service._process_mirror_transaction.await_count == 2
+
+    def test_seen_signatures_are_bounded(self, service, mirror_trading):
+        """Test remembered signatures are capped in number and age"""
+        assert service._seen_txs.maxsize == mirror_trading.SEEN_TX_MAXSIZE
+        assert service._seen_txs.ttl == mirror_trading.SEEN_TX_TTL
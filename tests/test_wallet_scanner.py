@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from db import DatabaseManager
+from services import wallet_scanner
+from services.wallet_scanner import TopTraderScanner
+
+ADDRESSES = [f"0x{i:040x}" for i in range(20)]
+
+
+class TestAnalyzeConcurrently:
+    """Test suite for the scanner's bounded analysis pool"""
+
+    @pytest.fixture
+    def scanner(self):
+        """Top trader scanner with default settings"""
+        return TopTraderScanner()
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self, scanner):
+        """Test results line up with addresses even when later ones finish first"""
+        async def analyze(address):
+            await asyncio.sleep(0.001 * (len(ADDRESSES) - ADDRESSES.index(address)))
+            return address.upper()
+
+        results = await scanner._analyze_concurrently(ADDRESSES, analyze)
+
+        assert results == [address.upper() for address in ADDRESSES]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_analyses_are_bounded(self, scanner):
+        """Test no more than ANALYSIS_CONCURRENCY analyses run at once"""
+        in_flight = 0
+        peak = 0
+
+        async def analyze(address):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return address
+
+        await scanner._analyze_concurrently(ADDRESSES, analyze)
+
+        assert peak == wallet_scanner.ANALYSIS_CONCURRENCY
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_does_not_stop_the_pool(self, scanner):
+        """Test an exception yields None for that address and the rest still run"""
+        failing = {ADDRESSES[0], ADDRESSES[5]}
+
+        async def analyze(address):
+            if address in failing:
+                raise RuntimeError("upstream error")
+            return address
+
+        results = await scanner._analyze_concurrently(ADDRESSES, analyze)
+
+        assert results == [None if address in failing else address for address in ADDRESSES]
+
+    @pytest.mark.asyncio
+    async def test_no_addresses(self, scanner):
+        """Test an empty address list returns without starting workers"""
+        async def analyze(address):
+            raise AssertionError("should not be called")
+
+        assert await scanner._analyze_concurrently([], analyze) == []
+
+
+class TestStoreScannerResults:
+    """Test suite for persisting scan results"""
+
+    @pytest.mark.asyncio
+    async def test_traders_are_written_to_wallets(self, tmp_path, monkeypatch):
+        """Test qualifying traders are upserted into the wallets table"""
+        db_manager = DatabaseManager(str(tmp_path / "scanner.db"))
+        monkeypatch.setattr(wallet_scanner, 'get_db_manager', lambda: db_manager)
+        trader = {'wallet_address': ADDRESSES[0], 'score': 82.0, 'win_rate': 71.0, 'max_multiplier': 120.0}
+
+        await TopTraderScanner()._store_scanner_results([trader], '7d', 'ethereum')
+
+        stored = db_manager.get_wallet_metrics(ADDRESSES[0], 'ethereum')
+        assert stored is not None
+        assert stored.score == 82.0
+        assert stored.win_rate == 71.0
+        assert stored.max_mult == 120.0
+
+
+class TestTopTradersScanSharing:
+    """Test suite for caching and sharing of the top traders scan"""
+
+    @pytest.fixture
+    def scanner(self):
+        """Top trader scanner whose scan is supplied by the test"""
+        scanner = TopTraderScanner()
+        scanner.scans = 0
+        return scanner
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_scan(self, scanner):
+        """Test callers arriving during a scan wait for it instead of starting another"""
+        release = asyncio.Event()
+        traders = [{'wallet_address': ADDRESSES[0], 'score': 90}]
+
+        async def run_scan(limit, cache_key):
+            scanner.scans += 1
+            await release.wait()
+            return traders
+
+        scanner._run_top_traders_scan = run_scan
+        callers = [asyncio.create_task(scanner.scan_top_traders_fallback(limit=5)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*callers) == [traders] * 3
+        assert scanner.scans == 1
+        assert scanner._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_finished_scan_is_cached(self, scanner, monkeypatch):
+        """Test a completed scan serves later calls from the cache"""
+        analyzed = []
+
+        async def analyze(address):
+            analyzed.append(address)
+            return None
+
+        monkeypatch.setattr(scanner, '_analyze_trader_performance_fallback', analyze)
+
+        first = await scanner.scan_top_traders_fallback(limit=5)
+        second = await scanner.scan_top_traders_fallback(limit=5)
+
+        assert first == second == []
+        assert len(analyzed) == len(scanner.seed_wallets)
+        assert scanner.cache.get("top_traders_5") == []
+
+    @pytest.mark.asyncio
+    async def test_cache_is_keyed_by_limit(self, scanner):
+        """Test different limits run their own scans"""
+        async def run_scan(limit, cache_key):
+            scanner.scans += 1
+            scanner.cache.set(cache_key, [])
+            return []
+
+        scanner._run_top_traders_scan = run_scan
+        await scanner.scan_top_traders_fallback(limit=5)
+        await scanner.scan_top_traders_fallback(limit=10)
+        await scanner.scan_top_traders_fallback(limit=5)
+
+        assert scanner.scans == 2
+
+    def test_cache_is_bounded(self, scanner):
+        """Test the scan cache has a size limit"""
+        assert scanner.cache.maxsize is not None
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import sqlite3
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from services import wallet_analyzer as wallet_analyzer_module
+from services.wallet_analyzer import WalletAnalyzer
+
+WALLET = "0x742d35Cc6aD5C87B7c2d3fa7f5C95Ab3cde74d6b"
+TRANSFERS = [{'from_address': WALLET.lower(), 'to_address': '0xabc', 'value_quote': 10.0}]
+
+
+class TestCachedGetTransfers:
+    """Test suite for shared wallet transfer fetches"""
+
+    @pytest.fixture
+    def analyzer(self, tmp_path, monkeypatch):
+        """Analyzer with a stubbed Covalent client and a temporary transfers cache"""
+        monkeypatch.setattr(wallet_analyzer_module, 'TRANSFERS_CACHE_PATH',
+                            str(tmp_path / "wallet_transfers.sqlite"))
+        analyzer = WalletAnalyzer()
+        analyzer.covalent_client = Mock()
+        analyzer.covalent_client.get_transfers = AsyncMock(return_value=TRANSFERS)
+        return analyzer
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self, analyzer):
+        """Test concurrent lookups for one wallet make a single request"""
+        release = asyncio.Event()
+
+        async def slow_fetch(chain_id, address, page_size):
+            await release.wait()
+            return TRANSFERS
+
+        analyzer.covalent_client.get_transfers.side_effect = slow_fetch
+        callers = [asyncio.create_task(analyzer._cached_get_transfers(1, WALLET, 100)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*callers) == [TRANSFERS] * 3
+        assert analyzer.covalent_client.get_transfers.await_count == 1
+        assert analyzer._transfers_inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_result_is_cached_case_insensitively(self, analyzer):
+        """Test a finished fetch serves later lookups for any address casing"""
+        assert await analyzer._cached_get_transfers(1, WALLET, 100) == TRANSFERS
+        assert await analyzer._cached_get_transfers(1, WALLET.lower(), 100) == TRANSFERS
+
+        assert analyzer.covalent_client.get_transfers.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_key_includes_chain_and_page_size(self, analyzer):
+        """Test different chains and page sizes are fetched separately"""
+        await analyzer._cached_get_transfers(1, WALLET, 100)
+        await analyzer._cached_get_transfers(56, WALLET, 100)
+        await analyzer._cached_get_transfers(1, WALLET, 500)
+
+        assert analyzer.covalent_client.get_transfers.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_result_is_not_cached(self, analyzer):
+        """Test an empty (failed) fetch is retried on the next lookup"""
+        analyzer.covalent_client.get_transfers.side_effect = [[], TRANSFERS]
+
+        assert await analyzer._cached_get_transfers(1, WALLET, 100) == []
+        assert await analyzer._cached_get_transfers(1, WALLET, 100) == TRANSFERS
+        assert analyzer.covalent_client.get_transfers.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_cached(self, analyzer):
+        """Test an exception reaches the caller and the next lookup retries"""
+        analyzer.covalent_client.get_transfers.side_effect = [RuntimeError("boom"), TRANSFERS]
+
+        with pytest.raises(RuntimeError):
+            await analyzer._cached_get_transfers(1, WALLET, 100)
+        assert await analyzer._cached_get_transfers(1, WALLET, 100) == TRANSFERS
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_fetch(self, analyzer):
+        """Test one caller giving up leaves the fetch running for the others"""
+        release = asyncio.Event()
+
+        async def slow_fetch(chain_id, address, page_size):
+            await release.wait()
+            return TRANSFERS
+
+        analyzer.covalent_client.get_transfers.side_effect = slow_fetch
+        first = asyncio.create_task(analyzer._cached_get_transfers(1, WALLET, 100))
+        second = asyncio.create_task(analyzer._cached_get_transfers(1, WALLET, 100))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == TRANSFERS
+        assert first.cancelled()
+
+
+class TestPersistedTransfers:
+    """Test suite for transfers persisted across restarts"""
+
+    @pytest.fixture
+    def cache_path(self, tmp_path, monkeypatch):
+        """Temporary on-disk transfers cache"""
+        path = str(tmp_path / "wallet_transfers.sqlite")
+        monkeypatch.setattr(wallet_analyzer_module, 'TRANSFERS_CACHE_PATH', path)
+        return path
+
+    def make_analyzer(self, *results):
+        """Analyzer whose Covalent client returns results in order"""
+        analyzer = WalletAnalyzer()
+        analyzer.covalent_client = Mock()
+        analyzer.covalent_client.get_transfers = AsyncMock(side_effect=list(results))
+        return analyzer
+
+    def test_cache_file_is_opened_lazily(self, cache_path):
+        """Test creating an analyzer does not touch the on-disk cache"""
+        self.make_analyzer()
+
+        assert not os.path.exists(cache_path)
+
+    @pytest.mark.asyncio
+    async def test_transfers_survive_restart(self, cache_path):
+        """Test a fetched result is served from disk by a new analyzer"""
+        await self.make_analyzer(TRANSFERS)._cached_get_transfers(1, WALLET, 100)
+
+        restarted = self.make_analyzer()
+        assert await restarted._cached_get_transfers(1, WALLET, 100) == TRANSFERS
+        assert restarted.covalent_client.get_transfers.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_fetch_is_not_written_to_disk(self, cache_path):
+        """Test a failed (empty) fetch never reaches the persisted cache"""
+        await self.make_analyzer([])._cached_get_transfers(1, WALLET, 100)
+
+        rows = sqlite3.connect(cache_path).execute("SELECT COUNT(*) FROM cache").fetchone()
+        assert rows[0] == 0
+
+    @pytest.mark.asyncio
+    async def test_persisted_empty_entry_is_refetched(self, cache_path):
+        """Test an empty entry left on disk by an older build is treated as a miss"""
+        stale = self.make_analyzer()
+        stale._get_transfers_cache().set((1, WALLET.lower(), 100), [])
+
+        restarted = self.make_analyzer(TRANSFERS)
+        assert await restarted._cached_get_transfers(1, WALLET, 100) == TRANSFERS
+        assert restarted.covalent_client.get_transfers.await_count == 1
+
+
+class TestModuleInstance:
+    """Test suite for the module-level analyzer"""
+
+    def test_global_instance_is_the_full_analyzer(self):
+        """Test the shared instance supports both wallet and token analysis"""
+        assert isinstance(wallet_analyzer_module.wallet_analyzer, WalletAnalyzer)
+        assert hasattr(wallet_analyzer_module.wallet_analyzer, 'analyze_token')
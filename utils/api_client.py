@@ -1,20 +1,25 @@
 import asyncio
 import aiohttp
 import logging
+import orjson
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+def create_connector() -> aiohttp.TCPConnector:
+    """Keep-alive pool so concurrent scans reuse warm TLS connections"""
+    return aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=30)
+
 class APIClient:
     """API Client utilities for Meme Trader V4 Pro"""
     def __init__(self):
         self.session = None
 
     async def get_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(connector=create_connector())
         return self.session
 
     async def close(self):
@@ -27,7 +32,7 @@ class APIClient:
             session = await self.get_session()
             async with session.get(url, params=params) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return await response.json(loads=orjson.loads)
                 else:
                     logger.error(f"API request failed: {response.status}")
                     return None
@@ -41,7 +46,7 @@ class APIClient:
             session = await self.get_session()
             async with session.post(url, json=data) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return await response.json(loads=orjson.loads)
                 else:
                     logger.error(f"API request failed: {response.status}")
                     return None
@@ -56,6 +61,7 @@ class CovalentAPI:
         self.base_url = "https://api.covalenthq.com/v1"
         self.chain_id = Config.CHAIN_ID
         self.session = None
+        self._session_lock = asyncio.Lock()
         self.rate_limit_reset = datetime.utcnow()
         self.requests_made = 0
         self.max_requests_per_minute = 100
@@ -64,15 +70,19 @@ class CovalentAPI:
         """Get or create aiohttp session with rotated API key"""
         from utils.key_manager import key_manager
         
-        if self.session is None or self.session.closed:
-            api_key = await key_manager.get_key('covalent')
-            if not api_key:
-                raise Exception("No Covalent API keys available")
-                
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT),
-                headers={'Authorization': f'Bearer {api_key}'}
-            )
+        # Concurrent callers would otherwise each create (and leak) a session
+        # while the first one is still waiting on the key manager
+        async with self._session_lock:
+            if self.session is None or self.session.closed:
+                api_key = await key_manager.get_key('covalent')
+                if not api_key:
+                    raise Exception("No Covalent API keys available")
+
+                self.session = aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT),
+                    connector=create_connector(),
+                    headers={'Authorization': f'Bearer {api_key}'}
+                )
         return self.session
 
     async def close_session(self):
@@ -91,7 +101,7 @@ class CovalentAPI:
 
             async with session.get(url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=orjson.loads)
                     return data.get('data')
                 elif response.status == 429:
                     logger.warning("Rate limit exceeded, rotating API key...")
@@ -0,0 +1,145 @@
+"""
+TTL cache for API lookups with optional on-disk persistence
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Dict-backed cache whose entries expire after a fixed TTL
+
+    With maxsize set, the least recently used entry is evicted once the
+    cache is full. With persist_path set, entries are written through to a
+    small SQLite file so unexpired values survive a restart. Persisted keys
+    are stored as strings and values must be JSON-serializable.
+    """
+
+    def __init__(self, ttl: float = 60, persist_path: Optional[str] = None,
+                 maxsize: Optional[int] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._disk: Optional[sqlite3.Connection] = None
+        if persist_path:
+            self._disk = self._open_disk(persist_path)
+
+    def _open_disk(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open the backing store and purge expired rows"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+            return conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Cache persistence disabled for {path}: {e}")
+            return None
+
+    def _get_from_disk(self, key: Hashable) -> Tuple[bool, Any]:
+        """Load an unexpired entry from disk into memory"""
+        try:
+            row = self._disk.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (str(key),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache read failed: {e}")
+            return False, None
+
+        if row is None:
+            return False, None
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return False, None
+
+        value = json.loads(row[0])
+        self._store(key, time.monotonic() + remaining, value)
+        return True, value
+
+    def _store(self, key: Hashable, expires_at: float, value: Any):
+        """Insert an entry in memory, evicting the LRU entry when full"""
+        self._data[key] = (expires_at, value)
+        if self.maxsize is not None:
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            if self._disk is not None:
+                found, value = self._get_from_disk(key)
+                if found:
+                    return value
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        if self.maxsize is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value for the cache TTL, or a per-entry ttl override"""
+        self.set_many(((key, value),), ttl=ttl)
+
+    def set_many(self, items: Iterable[Tuple[Hashable, Any]], ttl: Optional[float] = None):
+        """Store several values, writing them through to disk in one commit"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl
+        rows = []
+        for key, value in items:
+            self._store(key, expires_at, value)
+            if self._disk is not None:
+                rows.append((key, value))
+
+        if rows:
+            disk_expires_at = time.time() + ttl
+            try:
+                self._disk.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    [(str(key), json.dumps(value), disk_expires_at) for key, value in rows]
+                )
+                self._disk.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Cache write failed: {e}")
+
+    def delete(self, key: Hashable):
+        """Drop a cached entry if present"""
+        self._data.pop(key, None)
+        if self._disk is not None:
+            try:
+                self._disk.execute("DELETE FROM cache WHERE key = ?", (str(key),))
+                self._disk.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Cache delete failed: {e}")
+
+    def clear(self):
+        """Drop all cached entries"""
+        self._data.clear()
+        if self._disk is not None:
+            try:
+                self._disk.execute("DELETE FROM cache")
+                self._disk.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Cache clear failed: {e}")
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -189,7 +189,7 @@ class KeyRotationManager:
     
     def mark_key_cooldown(self, service: str, key: str, cooldown_seconds: int = 300):
         """Mark key as in cooldown (rate limited)"""
-            if service not in self.keys:
+        if service not in self.keys:
             return
         
         key_hash = self._hash_key(key)